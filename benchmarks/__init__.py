@@ -0,0 +1,10 @@
+"""
+Набор замеров производительности алгоритмов лабораторных работ.
+
+Запуск из корня репозитория:
+    python -m benchmarks                      # все замеры, результаты в benchmarks/results.json
+    python -m benchmarks -k lab6              # только замеры, в имени которых есть "lab6"
+    python -m benchmarks --save-baseline      # сохранить результаты как эталон
+Если эталон (benchmarks/baseline.json) существует, результаты сравниваются с ним,
+а замедления сверх порога выводятся отдельно (код возврата 1).
+"""
@@ -0,0 +1,131 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.cases import CASES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure(function, repeat, min_time):
+    """
+    Замеряет функцию repeat раз. Если один вызов короче min_time,
+    в одном замере выполняется несколько вызовов, а время делится на их число.
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    number = max(1, int(min_time / elapsed)) if elapsed > 0 else 1000
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return {"best": min(timings), "median": statistics.median(timings),
+            "repeat": repeat, "number": number}
+
+
+def run(pattern, repeat, min_time):
+    results = {}
+    for name, sizes, make in CASES:
+        if pattern and pattern not in name:
+            continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            try:
+                function = make(size)
+                results[key] = measure(function, repeat, min_time)
+            except Exception as ex:
+                results[key] = {"error": f"{type(ex).__name__}: {ex}"}
+                print(f"{key:<55} ошибка: {results[key]['error']}")
+                continue
+            print(f"{key:<55} {results[key]['best'] * 1000:>12.3f} мс")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Сравнивает результаты с эталоном; возвращает список замедлившихся замеров."""
+    regressions = []
+    print(f"\nСравнение с эталоном (порог x{threshold:.2f}):")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None or "best" not in current or "best" not in previous:
+            continue
+        ratio = current["best"] / previous["best"]
+        mark = ""
+        if ratio > threshold:
+            mark = "  ЗАМЕДЛЕНИЕ"
+            regressions.append(key)
+        elif ratio < 1 / threshold:
+            mark = "  ускорение"
+        print(f"{key:<55} x{ratio:>7.2f}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Замеры производительности алгоритмов лабораторных работ")
+    parser.add_argument("-k", dest="pattern", default="",
+                        help="запускать только замеры, в имени которых есть эта подстрока")
+    parser.add_argument("--repeat", type=int, default=5, help="число повторов каждого замера")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="минимальная длительность одного повтора, с")
+    parser.add_argument("--output", default=os.path.join(HERE, "results.json"),
+                        help="файл для результатов в формате JSON")
+    parser.add_argument("--baseline", default=os.path.join(HERE, "baseline.json"),
+                        help="файл с эталонными результатами")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="сохранить результаты как эталон (с -k – обновить в эталоне только эти замеры)")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="во сколько раз замер может быть медленнее эталона")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat, args.min_time)
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nРезультаты записаны в {args.output}")
+
+    errors = [key for key, result in results.items() if "error" in result]
+    status = 0
+    if errors:
+        print(f"\nЗавершились с ошибкой {len(errors)} замер(ов): " + ", ".join(errors))
+        status = 1
+
+    if args.save_baseline:
+        # В эталон попадают только удачные замеры. С -k замерена только часть случаев,
+        # а для замеров с ошибкой сохраняется прежнее эталонное значение
+        baseline = {"results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        kept = {key: value for key, value in baseline["results"].items() if args.pattern or key in errors}
+        measured = {key: value for key, value in results.items() if key not in errors}
+        baseline.update(report, results={**kept, **measured})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"Эталон сохранён в {args.baseline}")
+        return status
+
+    if not os.path.exists(args.baseline):
+        print("Эталон не найден: сохраните его с помощью --save-baseline")
+        return status
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nЗамедлились {len(regressions)} замер(ов): " + ", ".join(regressions))
+        return 1
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
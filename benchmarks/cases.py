@@ -0,0 +1,241 @@
+"""
+Описание замеров. Каждый замер – функция make(size), которая готовит входные
+данные заданного размера и возвращает функцию без аргументов для замера времени.
+"""
+import importlib.util
+import math
+import os
+import random
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = []
+
+
+def case(name, sizes):
+    """Регистрирует замер name для ряда размеров входных данных sizes."""
+    def decorator(make):
+        CASES.append((name, tuple(sizes), make))
+        return make
+    return decorator
+
+
+_modules = {}
+
+
+def load(lab, module):
+    """
+    Загружает модуль лабораторной работы по пути к файлу.
+    Папки лабораторных не являются пакетами, а имена модулей повторяются
+    (lab5/logic.py и lab6/logic.py), поэтому модуль регистрируется как "<lab>.<module>".
+    """
+    key = f"{lab}.{module}"
+    if key not in _modules:
+        lab_dir = os.path.join(ROOT, lab)
+        if lab_dir not in sys.path:
+            sys.path.insert(0, lab_dir)
+        spec = importlib.util.spec_from_file_location(key, os.path.join(lab_dir, module + ".py"))
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _modules[key] = mod
+    return _modules[key]
+
+
+class RecordingCanvas:
+    """Заменитель tk.Canvas: запоминает вызовы create_line, не требуя дисплея."""
+
+    def __init__(self):
+        self.lines = []
+
+    def create_line(self, *args, **kwargs):
+        self.lines.append(args)
+        return len(self.lines)
+
+    def update(self):
+        pass
+
+    def after(self, delay, callback=None, *args):
+        pass
+
+
+def random_segments(rng, count, extent=1000):
+    return [tuple(rng.randint(0, extent) for _ in range(4)) for _ in range(count)]
+
+
+def random_points(rng, count, extent=1000):
+    return [(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(count)]
+
+
+def star_polygon(count, radius, center=(0, 0)):
+    """Невыпуклый звёздчатый многоугольник из count вершин."""
+    cx, cy = center
+    vertices = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        r = radius if i % 2 == 0 else radius * 0.6
+        vertices.append((cx + r * math.cos(angle), cy + r * math.sin(angle)))
+    return vertices
+
+
+# lab12: растеризация линий и кривых второго порядка
+
+for _name in ("compute_dda_points", "compute_bresenham_points",
+              "compute_wu_points", "compute_wu_points_int"):
+    @case(f"lab12.{_name}", sizes=(10, 100, 1000))
+    def _make(size, _name=_name):
+        function = getattr(load("lab12", "first_order_algorithms"), _name)
+        segments = random_segments(random.Random(size), size)
+        return lambda: [function(*seg) for seg in segments]
+
+
+for _name in ("dda", "bresenham", "wu"):
+    @case(f"lab12.compute_{_name}_points_batch", sizes=(10, 100, 1000, 10000))
+    def _make(size, _name=_name):
+        function = getattr(load("lab12", "first_order_algorithms"), f"compute_{_name}_points_batch")
+        endpoints = np.array(random_segments(random.Random(size), size))
+        return lambda: function(endpoints)
+
+
+for _name in ("circle", "ellipse", "hyperbola", "parabola"):
+    @case(f"lab12.compute_{_name}_points", sizes=(50, 200, 800))
+    def _make(size, _name=_name):
+        function = getattr(load("lab12", "second_order_algorithms"), f"compute_{_name}_points")
+        return lambda: function(1000, 1000, 1000 + size, 1000 + size // 2)
+
+
+# lab3: кривые
+
+for _name in ("hermite", "bezier", "bspline"):
+    @case(f"lab3.{_name}_curve_segments", sizes=(10, 100, 1000))
+    def _make(size, _name=_name):
+        function = getattr(load("lab3", "curve_logic"), f"{_name}_curve_segments")
+        points = random_points(random.Random(size), size, extent=600)
+        return lambda: function(points)
+
+
+for _name in ("hermite", "bezier", "bspline"):
+    @case(f"lab3.{_name}_curve_segments[adaptive]", sizes=(10, 100, 1000))
+    def _make(size, _name=_name):
+        function = getattr(load("lab3", "curve_logic"), f"{_name}_curve_segments")
+        points = random_points(random.Random(size), size, extent=600)
+        return lambda: function(points, tolerance=0.5)
+
+
+@case("lab3.bezier_curve_points[full degree]", sizes=(10, 50, 200))
+def _make(size):
+    logic = load("lab3", "curve_logic")
+    points = random_points(random.Random(size), size, extent=600)
+    return lambda: logic.bezier_curve_points(points, piecewise=False)
+
+
+for _kind in ("Hermite", "B-Spline"):
+    @case(f"lab3.CurveModel.move_point[{_kind}]", sizes=(10, 100, 1000))
+    def _make(size, _kind=_kind):
+        model = load("lab3", "curve_model").CurveModel(_kind, random_points(random.Random(size), size, extent=600))
+        index = size // 2
+        return lambda: model.move_point(index, (300.0, 300.0))
+
+
+# lab4: трёхмерные преобразования
+
+@case("lab4.apply_transformation", sizes=(100, 10000, 100000))
+def _make(size):
+    logic = load("lab4", "transformation_logic")
+    rng = np.random.default_rng(size)
+    points = [tuple(p) for p in rng.uniform(-100, 100, size=(size, 3)).tolist()]
+    return lambda: logic.apply_transformation(points, 10, 20, 30, 15, 30, 45, 1.5, 1.5, 1.5)
+
+
+@case("lab4.apply_transformation[homogeneous, out]", sizes=(100, 10000, 100000))
+def _make(size):
+    logic = load("lab4", "transformation_logic")
+    points = logic.to_homogeneous(np.random.default_rng(size).uniform(-100, 100, size=(size, 3)))
+    out = np.empty_like(points)
+    return lambda: logic.apply_transformation(points, 10, 20, 30, 15, 30, 45, 1.5, 1.5, 1.5, out=out)
+
+
+@case("lab4.clip_edges", sizes=(1000, 100000, 1000000))
+def _make(size):
+    logic = load("lab4", "transformation_logic")
+    rng = np.random.default_rng(size)
+    points = logic.to_homogeneous(rng.uniform(-2000, 2000, size=(size, 3)))
+    edges = rng.integers(0, size, size=(size, 2))
+    planes = logic.frustum_planes(500, 800, 600, 400, 300)
+    return lambda: logic.clip_edges(points, edges, planes)
+
+
+@case("lab4.unique_edges", sizes=(1000, 100000, 1000000))
+def _make(size):
+    mesh_import = load("lab4", "mesh_import")
+    triangles = np.random.default_rng(size).integers(0, size, size=(size, 3))
+    counts = np.full(size, 3)
+    return lambda: mesh_import.unique_edges(mesh_import.polygon_edges(triangles.ravel(), counts), size)
+
+
+@case("lab4.hidden_line_segments", sizes=(1000, 10000, 100000))
+def _make(size):
+    mesh_import = load("lab4", "mesh_import")
+    hidden_lines = load("lab4", "hidden_lines")
+    # UV-сфера примерно из size треугольников
+    rows = max(2, int(math.sqrt(size / 4)))
+    theta, phi = np.meshgrid(np.linspace(0, np.pi, rows + 1), np.linspace(0, 2 * np.pi, 2 * rows + 1), indexing="ij")
+    points = np.stack((np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta), np.ones_like(theta)),
+                      axis=-1).reshape(-1, 4)
+    points[:, :3] *= 250
+    grid = np.arange(len(points)).reshape(rows + 1, 2 * rows + 1)
+    quads = np.stack((grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]), axis=-1).reshape(-1)
+    counts = np.full(len(quads) // 4, 4)
+    triangles = mesh_import.triangulate_polygons(quads, counts)
+    edges = mesh_import.unique_edges(mesh_import.polygon_edges(quads, counts), len(points))
+    return lambda: hidden_lines.hidden_line_segments(points, edges, triangles, 800, 600, 400, 300, 500)
+
+
+# lab5: выпуклая оболочка и пересечения
+
+for _name in ("convex_hull", "convex_hull_jarvis"):
+    @case(f"lab5.{_name}", sizes=(100, 1000, 10000))
+    def _make(size, _name=_name):
+        function = getattr(load("lab5", "logic"), _name)
+        points = random_points(random.Random(size), size)
+        return lambda: function(points)
+
+
+@case("lab5.line_polygon_intersections", sizes=(100, 1000, 10000))
+def _make(size):
+    logic = load("lab5", "logic")
+    polygon = star_polygon(size, 400, center=(500, 500))
+    line = ((0, 0), (1000, 1000))
+    return lambda: logic.line_polygon_intersections(line, polygon)
+
+
+# lab6: заливка многоугольников (на холсте, который только записывает вызовы)
+
+for _name in ("fill_polygon_ordered_edge_list", "fill_polygon_active_edge_list"):
+    @case(f"lab6.{_name}", sizes=(50, 200, 800))
+    def _make(size, _name=_name):
+        function = getattr(load("lab6", "logic"), _name)
+        polygon = star_polygon(16, size / 2, center=(size / 2, size / 2))
+        return lambda: function(polygon, RecordingCanvas())
+
+
+for _name in ("simple_seed_fill", "scanline_seed_fill"):
+    @case(f"lab6.{_name}", sizes=(20, 50, 100))
+    def _make(size, _name=_name):
+        function = getattr(load("lab6", "logic"), _name)
+        polygon = star_polygon(16, size / 2, center=(size / 2, size / 2))
+        seed = (size / 2, size / 2)
+        return lambda: function(polygon, RecordingCanvas(), seed)
+
+
+# lab7: достраивание бесконечных областей диаграммы Вороного
+
+@case("lab7.voronoi_finite_polygons_2d", sizes=(100, 1000, 10000))
+def _make(size):
+    import scipy.spatial
+    lab7 = load("lab7", "main")
+    rng = np.random.default_rng(size)
+    vor = scipy.spatial.Voronoi(rng.uniform(0, 1000, size=(size, 2)))
+    return lambda: lab7.voronoi_finite_polygons_2d(vor, radius=1000)
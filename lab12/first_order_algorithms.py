@@ -1,4 +1,6 @@
 import math
+from functools import lru_cache
+import numpy as np
 
 # Общие вспомогательные функции
 def ipart(x):
@@ -23,10 +25,20 @@ def intensity_to_hex(c):
     val = int(255 * (1 - c))
     return f"#{val:02x}{val:02x}{val:02x}"
 
+def iter_chunks(points, size=4096):
+    """Разбивает поток точек на списки не длиннее size."""
+    chunk = []
+    for pt in points:
+        chunk.append(pt)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 # Алгоритм ЦДА
-def compute_dda_points(x1, y1, x2, y2):
-    """Возвращает список точек (x, y, яркость=1.0) для алгоритма ЦДА."""
-    points = []
+def iter_dda_points(x1, y1, x2, y2):
+    """Потоковый алгоритм ЦДА: по одной точке (x, y, яркость=1.0)."""
     dx = x2 - x1
     dy = y2 - y1
     steps = int(max(abs(dx), abs(dy)))
@@ -35,15 +47,17 @@ def compute_dda_points(x1, y1, x2, y2):
     x = x1
     y = y1
     for _ in range(steps + 1):
-        points.append((x, y, 1.0))
+        yield (x, y, 1.0)
         x += x_inc
         y += y_inc
-    return points
+
+def compute_dda_points(x1, y1, x2, y2):
+    """Возвращает список точек (x, y, яркость=1.0) для алгоритма ЦДА."""
+    return list(iter_dda_points(x1, y1, x2, y2))
 
 # Алгоритм Брезенхема
-def compute_bresenham_points(x1, y1, x2, y2):
-    """Возвращает список точек (x, y, яркость=1.0) для алгоритма Брезенхема."""
-    points = []
+def iter_bresenham_points(x1, y1, x2, y2):
+    """Потоковый алгоритм Брезенхема: по одной точке (x, y, яркость=1.0)."""
     dx = abs(x2 - x1)
     dy = abs(y2 - y1)
     sx = 1 if x1 < x2 else -1
@@ -51,7 +65,7 @@ def compute_bresenham_points(x1, y1, x2, y2):
     err = dx - dy
 
     while True:
-        points.append((x1, y1, 1.0))
+        yield (x1, y1, 1.0)
         if x1 == x2 and y1 == y2:
             break
         e2 = 2 * err
@@ -61,12 +75,14 @@ def compute_bresenham_points(x1, y1, x2, y2):
         if e2 < dx:
             err += dx
             y1 += sy
-    return points
+
+def compute_bresenham_points(x1, y1, x2, y2):
+    """Возвращает список точек (x, y, яркость=1.0) для алгоритма Брезенхема."""
+    return list(iter_bresenham_points(x1, y1, x2, y2))
 
 # Алгоритм Ву для сглаживания
-def compute_wu_points(x0, y0, x1, y1):
-    """Возвращает список точек (x, y, яркость) для алгоритма Ву."""
-    points = []
+def iter_wu_points(x0, y0, x1, y1):
+    """Потоковый алгоритм Ву: по одной точке (x, y, яркость)."""
     steep = abs(y1 - y0) > abs(x1 - x0)
     if steep:
         x0, y0 = y0, x0
@@ -86,11 +102,11 @@ def compute_wu_points(x0, y0, x1, y1):
     xpxl1 = xend
     ypxl1 = ipart(yend)
     if steep:
-        points.append((ypxl1,   xpxl1, rfpart(yend) * xgap))
-        points.append((ypxl1 + 1, xpxl1, fpart(yend) * xgap))
+        yield (ypxl1,   xpxl1, rfpart(yend) * xgap)
+        yield (ypxl1 + 1, xpxl1, fpart(yend) * xgap)
     else:
-        points.append((xpxl1, ypxl1,   rfpart(yend) * xgap))
-        points.append((xpxl1, ypxl1 + 1, fpart(yend) * xgap))
+        yield (xpxl1, ypxl1,   rfpart(yend) * xgap)
+        yield (xpxl1, ypxl1 + 1, fpart(yend) * xgap)
     intery = yend + gradient
 
     # Второй конечный пиксель
@@ -103,17 +119,274 @@ def compute_wu_points(x0, y0, x1, y1):
     # Основной цикл
     for x in range(xpxl1 + 1, xpxl2):
         if steep:
-            points.append((ipart(intery),   x, rfpart(intery)))
-            points.append((ipart(intery) + 1, x, fpart(intery)))
+            yield (ipart(intery),   x, rfpart(intery))
+            yield (ipart(intery) + 1, x, fpart(intery))
         else:
-            points.append((x, ipart(intery),   rfpart(intery)))
-            points.append((x, ipart(intery) + 1, fpart(intery)))
+            yield (x, ipart(intery),   rfpart(intery))
+            yield (x, ipart(intery) + 1, fpart(intery))
         intery += gradient
 
     if steep:
-        points.append((ypxl2,   xpxl2, rfpart(yend) * xgap))
-        points.append((ypxl2 + 1, xpxl2, fpart(yend) * xgap))
+        yield (ypxl2,   xpxl2, rfpart(yend) * xgap)
+        yield (ypxl2 + 1, xpxl2, fpart(yend) * xgap)
+    else:
+        yield (xpxl2, ypxl2,   rfpart(yend) * xgap)
+        yield (xpxl2, ypxl2 + 1, fpart(yend) * xgap)
+
+def compute_wu_points(x0, y0, x1, y1):
+    """Возвращает список точек (x, y, яркость) для алгоритма Ву."""
+    return list(iter_wu_points(x0, y0, x1, y1))
+
+
+# Целочисленный алгоритм Ву: вместо вещественной дробной части intery
+# используется 16-битный накопитель ошибки, а яркость берётся из таблицы.
+WU_FRACTION_BITS = 16
+WU_ONE = 1 << WU_FRACTION_BITS
+
+@lru_cache(maxsize=None)
+def wu_intensity_table(levels=256):
+    """
+    Таблица из 256 яркостей: индекс – покрытие пикселя w (0..255),
+    значение – w / 255, квантованное до levels уровней (levels >= 2).
+    """
+    if levels < 2:
+        raise ValueError("Число уровней яркости должно быть не меньше 2")
+    top = levels - 1
+    return tuple(round(w * top / 255) / top for w in range(256))
+
+def iter_wu_points_int(x0, y0, x1, y1, levels=256):
+    """
+    Потоковый целочисленный алгоритм Ву (концы – целые числа).
+    Яркость квантуется до levels уровней.
+    """
+    table = wu_intensity_table(levels)
+    x0, y0, x1, y1 = int(x0), int(y0), int(x1), int(y1)
+    steep = abs(y1 - y0) > abs(x1 - x0)
+    if steep:
+        x0, y0 = y0, x0
+        x1, y1 = y1, x1
+    if x0 > x1:
+        x0, x1 = x1, x0
+        y0, y1 = y1, y0
+
+    dx = x1 - x0
+    dy = y1 - y0
+    sy = 1 if dy >= 0 else -1
+    # Концевые пиксели рисуются с полной яркостью
+    if steep:
+        yield (y0, x0, 1.0)
+    else:
+        yield (x0, y0, 1.0)
+    if dx == 0:
+        return
+
+    err_adj = (abs(dy) << WU_FRACTION_BITS) // dx
+    err = 0
+    y = y0
+    shift = WU_FRACTION_BITS - 8
+    for x in range(x0 + 1, x1):
+        err += err_adj
+        if err >= WU_ONE:
+            err -= WU_ONE
+            y += sy
+        w = err >> shift
+        if steep:
+            yield (y, x, table[255 - w])
+            yield (y + sy, x, table[w])
+        else:
+            yield (x, y, table[255 - w])
+            yield (x, y + sy, table[w])
+
+    if steep:
+        yield (y1, x1, 1.0)
     else:
-        points.append((xpxl2, ypxl2,   rfpart(yend) * xgap))
-        points.append((xpxl2, ypxl2 + 1, fpart(yend) * xgap))
-    return points
+        yield (x1, y1, 1.0)
+
+def compute_wu_points_int(x0, y0, x1, y1, levels=256):
+    """Возвращает список точек (x, y, яркость) для целочисленного алгоритма Ву."""
+    return list(iter_wu_points_int(x0, y0, x1, y1, levels))
+
+# Пакетная (векторизованная) растеризация отрезков
+# Результат – структурированный массив точек и массив смещений offsets:
+# точки i-го отрезка лежат в pixels[offsets[i]:offsets[i + 1]] в том же порядке,
+# что и у скалярных функций compute_*_points.
+POINT_DTYPE = np.dtype([("x", np.float64), ("y", np.float64), ("brightness", np.float64)])
+
+
+def _as_endpoints(endpoints):
+    """Приводит концы отрезков к массиву float64 формы (N, 4)."""
+    arr = np.asarray(endpoints, dtype=np.float64)
+    if arr.ndim == 1 and arr.size == 0:
+        arr = arr.reshape(0, 4)
+    if arr.ndim != 2 or arr.shape[1] != 4:
+        raise ValueError("Ожидается массив концов отрезков формы (N, 4)")
+    return arr
+
+
+def _allocate(counts):
+    """Создаёт выходной массив точек и смещения отрезков по числу точек каждого."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    pixels = np.empty(offsets[-1], dtype=POINT_DTYPE)
+    return pixels, offsets
+
+
+def _lockstep(counts):
+    """
+    Порядок обхода отрезков "в ногу": возвращает перестановку order, в которой
+    отрезки отсортированы по убыванию числа шагов, и генератор пар (k, m) –
+    номер шага k и число отрезков m, у которых этот шаг ещё есть.
+    Активные отрезки всегда образуют префикс order[:m].
+    """
+    order = np.argsort(-counts, kind="stable")
+    sorted_counts = counts[order]
+
+    def steps():
+        m = len(sorted_counts)
+        k = 0
+        while m:
+            while m and sorted_counts[m - 1] <= k:
+                m -= 1
+            if m:
+                yield k, m
+            k += 1
+
+    return order, steps()
+
+
+def compute_dda_points_batch(endpoints):
+    """Пакетный алгоритм ЦДА. Возвращает (pixels, offsets)."""
+    x1, y1, x2, y2 = _as_endpoints(endpoints).T
+    dx = x2 - x1
+    dy = y2 - y1
+    steps = np.maximum(np.abs(dx), np.abs(dy)).astype(np.int64)
+    nonzero = steps != 0
+    x_inc = np.divide(dx, steps, out=np.zeros_like(dx), where=nonzero)
+    y_inc = np.divide(dy, steps, out=np.zeros_like(dy), where=nonzero)
+
+    counts = steps + 1
+    pixels, offsets = _allocate(counts)
+    pixels["brightness"] = 1.0
+    out_x = pixels["x"]
+    out_y = pixels["y"]
+
+    order, steps_iter = _lockstep(counts)
+    start = offsets[:-1][order]
+    x = x1[order]
+    y = y1[order]
+    x_inc = x_inc[order]
+    y_inc = y_inc[order]
+    for k, m in steps_iter:
+        idx = start[:m] + k
+        out_x[idx] = x[:m]
+        out_y[idx] = y[:m]
+        x[:m] += x_inc[:m]
+        y[:m] += y_inc[:m]
+    return pixels, offsets
+
+
+def compute_bresenham_points_batch(endpoints):
+    """Пакетный алгоритм Брезенхема (целочисленные концы). Возвращает (pixels, offsets)."""
+    e = _as_endpoints(endpoints).astype(np.int64)
+    x1, y1, x2, y2 = e.T
+    dx = np.abs(x2 - x1)
+    dy = np.abs(y2 - y1)
+    sx = np.where(x1 < x2, 1, -1)
+    sy = np.where(y1 < y2, 1, -1)
+
+    counts = np.maximum(dx, dy) + 1
+    pixels, offsets = _allocate(counts)
+    pixels["brightness"] = 1.0
+    out_x = pixels["x"]
+    out_y = pixels["y"]
+
+    order, steps_iter = _lockstep(counts)
+    start = offsets[:-1][order]
+    x = x1[order]
+    y = y1[order]
+    dx = dx[order]
+    dy = dy[order]
+    sx = sx[order]
+    sy = sy[order]
+    err = dx - dy
+    for k, m in steps_iter:
+        idx = start[:m] + k
+        out_x[idx] = x[:m]
+        out_y[idx] = y[:m]
+        e2 = 2 * err[:m]
+        step_x = e2 > -dy[:m]
+        step_y = e2 < dx[:m]
+        err[:m] -= np.where(step_x, dy[:m], 0)
+        x[:m] += np.where(step_x, sx[:m], 0)
+        err[:m] += np.where(step_y, dx[:m], 0)
+        y[:m] += np.where(step_y, sy[:m], 0)
+    return pixels, offsets
+
+
+def compute_wu_points_batch(endpoints):
+    """Пакетный алгоритм Ву. Возвращает (pixels, offsets)."""
+    x0, y0, x1, y1 = _as_endpoints(endpoints).T
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+    x0, y0 = np.where(steep, y0, x0), np.where(steep, x0, y0)
+    x1, y1 = np.where(steep, y1, x1), np.where(steep, x1, y1)
+    swap = x0 > x1
+    x0, x1 = np.where(swap, x1, x0), np.where(swap, x0, x1)
+    y0, y1 = np.where(swap, y1, y0), np.where(swap, y0, y1)
+
+    dx = x1 - x0
+    dy = y1 - y0
+    gradient = np.divide(dy, dx, out=np.ones_like(dy), where=dx != 0)
+
+    # Первый конечный пиксель
+    xend = np.floor(x0 + 0.5)
+    yend1 = y0 + gradient * (xend - x0)
+    xgap1 = 1 - ((x0 + 0.5) - np.floor(x0 + 0.5))
+    xpxl1 = xend
+    ypxl1 = np.floor(yend1)
+    intery = yend1 + gradient
+
+    # Второй конечный пиксель
+    xend = np.floor(x1 + 0.5)
+    yend2 = y1 + gradient * (xend - x1)
+    xgap2 = (x1 + 0.5) - np.floor(x1 + 0.5)
+    xpxl2 = xend
+    ypxl2 = np.floor(yend2)
+
+    inner = np.maximum(xpxl2 - xpxl1 - 1, 0).astype(np.int64)
+    counts = 2 * inner + 4
+    pixels, offsets = _allocate(counts)
+    out_x = pixels["x"]
+    out_y = pixels["y"]
+    out_b = pixels["brightness"]
+
+    def put(idx, major, minor, brightness, steep):
+        out_x[idx] = np.where(steep, minor, major)
+        out_y[idx] = np.where(steep, major, minor)
+        out_b[idx] = brightness
+
+    start = offsets[:-1]
+    fpart1 = yend1 - np.floor(yend1)
+    put(start, xpxl1, ypxl1, (1 - fpart1) * xgap1, steep)
+    put(start + 1, xpxl1, ypxl1 + 1, fpart1 * xgap1, steep)
+    fpart2 = yend2 - np.floor(yend2)
+    last = offsets[1:] - 2
+    put(last, xpxl2, ypxl2, (1 - fpart2) * xgap2, steep)
+    put(last + 1, xpxl2, ypxl2 + 1, fpart2 * xgap2, steep)
+
+    # Основной цикл – все отрезки одновременно
+    order, steps_iter = _lockstep(inner)
+    start = start[order] + 2
+    x = xpxl1[order] + 1
+    intery = intery[order]
+    gradient = gradient[order]
+    steep = steep[order]
+    for k, m in steps_iter:
+        idx = start[:m] + 2 * k
+        cur = intery[:m]
+        floor = np.floor(cur)
+        fpart = cur - floor
+        put(idx, x[:m], floor, 1 - fpart, steep[:m])
+        put(idx + 1, x[:m], floor + 1, fpart, steep[:m])
+        x[:m] += 1
+        intery[:m] += gradient[:m]
+    return pixels, offsets
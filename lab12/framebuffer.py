@@ -0,0 +1,103 @@
+import tkinter as tk
+import numpy as np
+
+from first_order_algorithms import POINT_DTYPE
+
+
+def points_to_arrays(points):
+    """
+    Приводит результат любого compute_*_points (список кортежей (x, y, яркость)
+    или структурированный массив POINT_DTYPE) к трём массивам x, y, яркость.
+    """
+    if isinstance(points, np.ndarray) and points.dtype == POINT_DTYPE:
+        return points["x"], points["y"], points["brightness"]
+    arr = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    return arr[:, 0], arr[:, 1], arr[:, 2]
+
+
+class Framebuffer:
+    """
+    Внеэкранный буфер кадра: массив uint8 формы (height, width, 3).
+    Точки накладываются в буфер с альфа-смешиванием (яркость – коэффициент
+    покрытия), а на холст кадр выводится одним изображением PhotoImage.
+    """
+
+    def __init__(self, width, height, background=(255, 255, 255)):
+        self.background = np.array(background, dtype=np.uint8)
+        self.pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self.pixels[:] = self.background
+        self.image = None     # PhotoImage, создаётся при первом выводе
+        self.image_id = None  # id элемента холста с изображением
+        self.dirty = True
+
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+
+    def clear(self):
+        self.pixels[:] = self.background
+        self.dirty = True
+
+    def resize(self, width, height):
+        """Меняет размер буфера, сохраняя уже нарисованную часть кадра."""
+        if (width, height) == (self.width, self.height):
+            return
+        pixels = np.empty((height, width, 3), dtype=np.uint8)
+        pixels[:] = self.background
+        h = min(height, self.height)
+        w = min(width, self.width)
+        pixels[:h, :w] = self.pixels[:h, :w]
+        self.pixels = pixels
+        self.dirty = True
+
+    def composite(self, points, color=(0, 0, 0)):
+        """
+        Накладывает точки на буфер: пиксель = фон * (1 - c) + цвет * c.
+        Несколько точек в одном пикселе смешиваются последовательно.
+        """
+        xs, ys, alpha = points_to_arrays(points)
+        if len(xs) == 0:
+            return
+        xs = np.trunc(xs).astype(np.int64)
+        ys = np.trunc(ys).astype(np.int64)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.all():
+            xs, ys, alpha = xs[inside], ys[inside], alpha[inside]
+            if len(xs) == 0:
+                return
+        flat = ys * self.width + xs
+        touched, inverse = np.unique(flat, return_inverse=True)
+        # Доля фона, оставшаяся в каждом пикселе после всех наложений
+        keep = np.ones(len(touched))
+        np.multiply.at(keep, inverse, 1 - np.clip(alpha, 0, 1))
+        keep = keep[:, None]
+
+        buf = self.pixels.reshape(-1, 3)
+        ink = np.array(color, dtype=np.float64)
+        blended = buf[touched] * keep + ink * (1 - keep)
+        buf[touched] = blended.astype(np.uint8)
+        self.dirty = True
+
+    def to_ppm(self):
+        """Кадр в формате PPM (P6), который понимает tk.PhotoImage."""
+        header = f"P6 {self.width} {self.height} 255 ".encode()
+        return header + self.pixels.tobytes()
+
+    def present(self, canvas):
+        """Выводит кадр на холст: одно обновление изображения вместо элемента на пиксель."""
+        if not self.dirty and self.image is not None:
+            return
+        if self.image is None:
+            self.image = tk.PhotoImage(master=canvas, data=self.to_ppm(), format="PPM")
+        else:
+            self.image.configure(width=self.width, height=self.height,
+                                 data=self.to_ppm(), format="PPM")
+        if self.image_id is None or not canvas.find_withtag(self.image_id):
+            self.image_id = canvas.create_image(0, 0, anchor="nw", image=self.image,
+                                                tags="framebuffer")
+            canvas.tag_lower(self.image_id)
+        self.dirty = False
@@ -2,25 +2,27 @@ import tkinter as tk
 from tkinter import ttk
 
 from first_order_algorithms import (
-    compute_dda_points,
-    compute_bresenham_points,
-    compute_wu_points,
-    intensity_to_hex
+    iter_dda_points,
+    iter_bresenham_points,
+    iter_wu_points,
+    iter_wu_points_int,
+    iter_chunks
 )
 from second_order_algorithms import (
-    compute_circle_points,
-    compute_ellipse_points,
-    compute_hyperbola_points,
-    compute_parabola_points
+    iter_circle_points,
+    iter_ellipse_points,
+    iter_hyperbola_points,
+    iter_parabola_points
 )
+from framebuffer import Framebuffer
 
-# Функция для немедленного рисования точек (без задержки)
-def draw_points_immediate(canvas, points):
-    for pt in points:
-        x, y, brightness = pt
-        canvas.create_rectangle(int(x), int(y), int(x) + 1, int(y) + 1,
-                                  fill=intensity_to_hex(brightness),
-                                  outline=intensity_to_hex(brightness))
+# Функция для немедленного рисования точек (без задержки):
+# точки накладываются в буфер кадра порциями по мере их генерации,
+# после чего кадр выводится одним изображением
+def draw_points_immediate(framebuffer, canvas, points):
+    for chunk in iter_chunks(points):
+        framebuffer.composite(chunk)
+    framebuffer.present(canvas)
 
 class DrawingApp(tk.Tk):
     def __init__(self):
@@ -47,6 +49,8 @@ class DrawingApp(tk.Tk):
         # Центральная панель: холст для рисования
         self.canvas = tk.Canvas(self.main_frame, bg="white", width=600, height=500)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.framebuffer = Framebuffer(600, 500)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
 
         # Правая панель: алгоритмы, параметры, режим отладки и отладочная таблица
         self.right_frame = ttk.Frame(self.main_frame, width=250)
@@ -98,7 +102,7 @@ class DrawingApp(tk.Tk):
     def update_algorithm_options(self):
         lt = self.line_type.get()
         if lt == "Линии первого порядка":
-            self.algorithm_combobox["values"] = ["ЦДА", "Брезенхем", "Ву"]
+            self.algorithm_combobox["values"] = ["ЦДА", "Брезенхем", "Ву", "Ву (целочисленный)"]
             self.algorithm_combobox.set("ЦДА")
             self.algorithm_label.config(text="Алгоритмы 1-го порядка")
         else:
@@ -107,9 +111,14 @@ class DrawingApp(tk.Tk):
             self.algorithm_label.config(text="Алгоритмы 2-го порядка")
 
     def clear_canvas(self):
-        self.canvas.delete("all")
+        self.framebuffer.clear()
+        self.framebuffer.present(self.canvas)
         self.clear_debug_table()
 
+    def on_canvas_resize(self, event):
+        self.framebuffer.resize(event.width, event.height)
+        self.framebuffer.present(self.canvas)
+
     def on_click(self, event):
         self.start_x = event.x
         self.start_y = event.y
@@ -124,47 +133,48 @@ class DrawingApp(tk.Tk):
         debug = self.debug_mode.get()
         if lt == "Линии первого порядка":
             if algo == "ЦДА":
-                pts = compute_dda_points(self.start_x, self.start_y, end_x, end_y)
+                pts = iter_dda_points(self.start_x, self.start_y, end_x, end_y)
             elif algo == "Брезенхем":
-                pts = compute_bresenham_points(self.start_x, self.start_y, end_x, end_y)
+                pts = iter_bresenham_points(self.start_x, self.start_y, end_x, end_y)
             elif algo == "Ву":
-                pts = compute_wu_points(self.start_x, self.start_y, end_x, end_y)
+                pts = iter_wu_points(self.start_x, self.start_y, end_x, end_y)
+            elif algo == "Ву (целочисленный)":
+                pts = iter_wu_points_int(self.start_x, self.start_y, end_x, end_y)
             else:
-                pts = []
+                pts = iter(())
             if debug:
                 self.clear_debug_table()
                 self.draw_points_debug(pts)
             else:
-                draw_points_immediate(self.canvas, pts)
+                draw_points_immediate(self.framebuffer, self.canvas, pts)
         else:  # Линии второго порядка
             if algo == "Окружность":
                 if self.temp_center is None:
                     return
                 cx, cy = self.temp_center
-                pts = compute_circle_points(cx, cy, end_x, end_y)
+                pts = iter_circle_points(cx, cy, end_x, end_y)
             elif algo == "Эллипс":
                 if self.temp_center is None:
                     return
                 cx, cy = self.temp_center
-                pts = compute_ellipse_points(cx, cy, end_x, end_y)
+                pts = iter_ellipse_points(cx, cy, end_x, end_y)
             elif algo == "Гипербола":
                 if self.temp_center is None:
                     return
                 cx, cy = self.temp_center
-                pts = compute_hyperbola_points(cx, cy, end_x, end_y)
+                pts = iter_hyperbola_points(cx, cy, end_x, end_y)
             elif algo == "Парабола":
                 if self.temp_center is None:
                     return
                 cx, cy = self.temp_center
-                pts = compute_parabola_points(cx, cy, end_x, end_y)
+                pts = iter_parabola_points(cx, cy, end_x, end_y)
             else:
-                pts = []
-            if pts:
-                if debug:
-                    self.clear_debug_table()
-                    self.draw_points_debug(pts)
-                else:
-                    draw_points_immediate(self.canvas, pts)
+                pts = iter(())
+            if debug:
+                self.clear_debug_table()
+                self.draw_points_debug(pts)
+            else:
+                draw_points_immediate(self.framebuffer, self.canvas, pts)
             self.temp_center = None
 
     def clear_debug_table(self):
@@ -172,12 +182,12 @@ class DrawingApp(tk.Tk):
             self.debug_tree.delete(item)
 
     def draw_points_debug(self, points, index=0):
-        if index >= len(points):
+        # points – генератор: точки вычисляются по одной, по мере отрисовки
+        pt = next(points, None)
+        if pt is None:
             return
-        x, y, brightness = points[index]
-        self.canvas.create_rectangle(int(x), int(y), int(x)+1, int(y)+1,
-                                       fill=intensity_to_hex(brightness),
-                                       outline=intensity_to_hex(brightness))
+        x, y, brightness = pt
+        draw_points_immediate(self.framebuffer, self.canvas, [pt])
         self.debug_tree.insert("", "end",
                                values=(index, f"{x:.2f}", f"{y:.2f}", f"{brightness:.2f}"))
         delay = self.debug_delay.get()
@@ -1,45 +1,64 @@
 import math
+import numpy as np
 from first_order_algorithms import ipart, round_, fpart, rfpart
 
 # Построение окружности по алгоритму Брезенхэма
-def compute_circle_points(cx, cy, ex, ey):
-    """Первая точка – центр, вторая – точка на окружности."""
-    r = int(round(math.sqrt((ex - cx)**2 + (ey - cy)**2)))
-    points = []
+def _circle_radius(cx, cy, ex, ey):
+    return int(round(math.sqrt((ex - cx)**2 + (ey - cy)**2)))
+
+def _circle_octant(r):
+    """Точки первого октанта (0 <= x <= y) окружности радиуса r с центром в начале координат."""
     x = 0
     y = r
     d = 3 - 2 * r
-
-    def add_circle_points(cx, cy, x, y):
-        pts = [
-            (cx + x, cy + y, 1.0),
-            (cx - x, cy + y, 1.0),
-            (cx + x, cy - y, 1.0),
-            (cx - x, cy - y, 1.0),
-            (cx + y, cy + x, 1.0),
-            (cx - y, cy + x, 1.0),
-            (cx + y, cy - x, 1.0),
-            (cx - y, cy - x, 1.0)
-        ]
-        for pt in pts:
-            if pt not in points:
-                points.append(pt)
-
     while x <= y:
-        add_circle_points(cx, cy, x, y)
+        yield x, y
         if d < 0:
             d = d + 4 * x + 6
         else:
             d = d + 4 * (x - y) + 10
             y -= 1
         x += 1
-    points.sort(key=lambda p: (p[0], p[1]))
+
+def _octant_reflections(x, y):
+    """
+    Отражения точки октанта во все восемь октантов без повторов:
+    на границах октантов (x == 0 или x == y) часть отражений совпадает.
+    """
+    halves = [(x, y)] if x == y else [(x, y), (y, x)]
+    for a, b in halves:
+        for sb in ((b, -b) if b else (b,)):
+            for sa in ((a, -a) if a else (a,)):
+                yield sa, sb
+
+def iter_circle_points(cx, cy, ex, ey):
+    """Потоковый вариант: точки окружности в порядке построения, без сортировки."""
+    r = _circle_radius(cx, cy, ex, ey)
+    for x, y in _circle_octant(r):
+        for px, py in _octant_reflections(x, y):
+            yield (cx + px, cy + py, 1.0)
+
+def compute_circle_points(cx, cy, ex, ey):
+    """
+    Первая точка – центр, вторая – точка на окружности.
+    Строится один октант, остальные получаются отражением.
+    Возвращает массив NumPy формы (N, 3) со строками (x, y, яркость),
+    упорядоченный по (x, y).
+    """
+    r = _circle_radius(cx, cy, ex, ey)
+    # Те же отражения октанта, что и в iter_circle_points
+    xy = np.array([reflection for x, y in _circle_octant(r) for reflection in _octant_reflections(x, y)],
+                  dtype=np.int64).reshape(-1, 2)
+    xy = xy + (cx, cy)
+    xy = xy[np.lexsort((xy[:, 1], xy[:, 0]))]
+    points = np.empty((len(xy), 3))
+    points[:, :2] = xy
+    points[:, 2] = 1.0
     return points
 
 # Построение эллипса (метод середины эллипса)
-def compute_ellipse_points(cx, cy, ex, ey):
+def iter_ellipse_points(cx, cy, ex, ey):
     """Первый клик – центр, второй задаёт полуоси: a = |ex - cx|, b = |ey - cy|."""
-    points = []
     a = int(round(abs(ex - cx)))
     b = int(round(abs(ey - cy)))
     if a == 0: a = 1
@@ -51,12 +70,10 @@ def compute_ellipse_points(cx, cy, ex, ey):
     dy = 2 * a * a * y
 
     while dx < dy:
-        points.extend([
-            (cx + x, cy + y, 1.0),
-            (cx - x, cy + y, 1.0),
-            (cx + x, cy - y, 1.0),
-            (cx - x, cy - y, 1.0)
-        ])
+        yield (cx + x, cy + y, 1.0)
+        yield (cx - x, cy + y, 1.0)
+        yield (cx + x, cy - y, 1.0)
+        yield (cx - x, cy - y, 1.0)
         if d1 < 0:
             x += 1
             dx += 2 * b * b
@@ -70,12 +87,10 @@ def compute_ellipse_points(cx, cy, ex, ey):
 
     d2 = (b * b) * ((x + 0.5) ** 2) + (a * a) * ((y - 1) ** 2) - (a * a * b * b)
     while y >= 0:
-        points.extend([
-            (cx + x, cy + y, 1.0),
-            (cx - x, cy + y, 1.0),
-            (cx + x, cy - y, 1.0),
-            (cx - x, cy - y, 1.0)
-        ])
+        yield (cx + x, cy + y, 1.0)
+        yield (cx - x, cy + y, 1.0)
+        yield (cx + x, cy - y, 1.0)
+        yield (cx - x, cy - y, 1.0)
         if d2 > 0:
             y -= 1
             dy -= 2 * a * a
@@ -86,17 +101,19 @@ def compute_ellipse_points(cx, cy, ex, ey):
             dx += 2 * b * b
             dy -= 2 * a * a
             d2 = d2 + dx - dy + a * a
-    return points
+
+def compute_ellipse_points(cx, cy, ex, ey):
+    return list(iter_ellipse_points(cx, cy, ex, ey))
 
 # Построение симметричной гиперболы
-def compute_hyperbola_points(cx, cy, ex, ey):
+def iter_hyperbola_points(cx, cy, ex, ey):
     """
     Построение гиперболы по уравнению:
        ((x - cx)^2)/(a^2) - ((y - cy)^2)/(b^2) = 1
     где a = |ex - cx|, b = |ey - cy|.
-    Сначала строится правая ветвь (x >= cx + a), затем отражается по вертикали.
+    Каждая точка правой ветви (x >= cx + a) сразу отражается
+    относительно вертикальной оси через cx.
     """
-    points = []
     a = abs(ex - cx)
     if a == 0:
         a = 1
@@ -113,18 +130,16 @@ def compute_hyperbola_points(cx, cy, ex, ey):
             y_offset = b * math.sqrt(val)
         except ValueError:
             continue
-        points.append((x, cy + y_offset, 1.0))
-        points.append((x, cy - y_offset, 1.0))
-    # Отражаем полученную ветвь относительно вертикальной оси через cx
-    mirror_points = []
-    for (x, y, br) in points:
-        mirror_points.append((2 * cx - x, y, br))
-    all_points = points + mirror_points
-    all_points.sort(key=lambda p: (p[0], p[1]))
-    return all_points
+        yield (x, cy + y_offset, 1.0)
+        yield (x, cy - y_offset, 1.0)
+        yield (2 * cx - x, cy + y_offset, 1.0)
+        yield (2 * cx - x, cy - y_offset, 1.0)
+
+def compute_hyperbola_points(cx, cy, ex, ey):
+    return sorted(iter_hyperbola_points(cx, cy, ex, ey), key=lambda p: (p[0], p[1]))
 
 # Построение параболы с вершиной, открывающейся вверх
-def compute_parabola_points(cx, cy, ex, ey):
+def iter_parabola_points(cx, cy, ex, ey):
     """
     Построение параболы по уравнению:
          (x - cx)^2 = 4a * (y - cy)
@@ -133,7 +148,6 @@ def compute_parabola_points(cx, cy, ex, ey):
          a = (ex - cx)^2 / (4*(ey - cy))
     Если ey <= cy, используем a = 1.
     """
-    points = []
     if ey <= cy:
         a_param = 1
         y_end = cy + 100
@@ -146,6 +160,8 @@ def compute_parabola_points(cx, cy, ex, ey):
             offset = math.sqrt(4 * a_param * t)
         except ValueError:
             continue
-        points.append((cx + offset, y, 1.0))
-        points.append((cx - offset, y, 1.0))
-    return points
+        yield (cx + offset, y, 1.0)
+        yield (cx - offset, y, 1.0)
+
+def compute_parabola_points(cx, cy, ex, ey):
+    return list(iter_parabola_points(cx, cy, ex, ey))
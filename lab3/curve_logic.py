@@ -1,93 +1,309 @@
 # curve_logic.py
-def hermite_curve_segments(points):
+# Кривые строятся в виде ломаной – массива точек формы (M, 2): *_curve_points.
+# *_curve_segments возвращают ту же ломаную, разбитую на отрезки (M - 1, 4): x1, y1, x2, y2,
+# flatten_polyline – плоский список координат для canvas.create_line / canvas.coords.
+#
+# Сплайны вычисляются в матричной форме: для каждого сегмента берётся "окно" из четырёх
+# управляющих векторов (G, форма (4, 2)), а точки сегмента – произведение B @ G, где
+# B – матрица базисных функций формы (steps + 1, 4), вычисленная один раз для числа шагов.
+# Все сегменты кривой вычисляются одним произведением B @ windows (windows – (S, 4, 2)).
+#
+# Кривая Безье степени n = len(points) - 1 вычисляется так же: B – матрица многочленов
+# Бернштейна (steps + 1, n + 1). Для малых степеней она считается через биномиальные
+# коэффициенты, для больших – рекуррентно, как в алгоритме де Кастельжо (без переполнения).
+# Из 100 и более точек по умолчанию строится составная кривая из кубических кусков
+# P[0..3], P[3..6], ... с общими концами.
+#
+# Адаптивный режим (параметр tolerance, в пикселях): каждый сегмент переводится в кривую
+# Безье и делится пополам (де Кастельжо), пока отклонение от хорды не станет меньше
+# tolerance. Почти прямые участки дают один отрезок, крутые изгибы – столько, сколько нужно.
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# Число шагов по параметру t на один сегмент сплайна (и кусок составной кривой Безье)
+# и на всю кривую Безье
+SEGMENT_STEPS = 20
+BEZIER_STEPS = 100
+
+# Наибольшая степень, для которой многочлены Бернштейна считаются через биномиальные коэффициенты
+BINOMIAL_MAX_DEGREE = 30
+# Начиная с этого числа точек кривая Безье по умолчанию строится из кубических кусков
+PIECEWISE_MIN_POINTS = 100
+
+
+def polyline_segments(polyline):
+    """Разбивает ломаную (M, 2) на отрезки (M - 1, 4): x1, y1, x2, y2."""
+    polyline = np.asarray(polyline, dtype=float).reshape(-1, 2)
+    if len(polyline) < 2:
+        return np.empty((0, 4))
+    return np.hstack((polyline[:-1], polyline[1:]))
+
+
+def flatten_polyline(polyline):
+    """Ломаная [(x0, y0), (x1, y1), ...] -> [x0, y0, x1, y1, ...]."""
+    return np.asarray(polyline, dtype=float).ravel().tolist()
+
+
+def hermite_basis(t):
+    h00 = 2 * t ** 3 - 3 * t ** 2 + 1
+    h10 = t ** 3 - 2 * t ** 2 + t
+    h01 = -2 * t ** 3 + 3 * t ** 2
+    h11 = t ** 3 - t ** 2
+    return h00, h10, h01, h11
+
+
+def bspline_basis(t):
+    B0 = ((1 - t) ** 3) / 6.0
+    B1 = (3 * t ** 3 - 6 * t ** 2 + 4) / 6.0
+    B2 = (-3 * t ** 3 + 3 * t ** 2 + 3 * t + 1) / 6.0
+    B3 = (t ** 3) / 6.0
+    return B0, B1, B2, B3
+
+
+def _basis_matrix(basis, steps):
+    t = np.arange(steps + 1) / steps
+    matrix = np.column_stack(basis(t))
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=None)
+def hermite_basis_matrix(steps=SEGMENT_STEPS):
+    """Матрица (steps + 1, 4) базисных функций Эрмита h00, h10, h01, h11 при t = 0 .. 1."""
+    return _basis_matrix(hermite_basis, steps)
+
+
+@lru_cache(maxsize=None)
+def bspline_basis_matrix(steps=SEGMENT_STEPS):
+    """Матрица (steps + 1, 4) базисных функций однородного кубического B-сплайна."""
+    return _basis_matrix(bspline_basis, steps)
+
+
+def hermite_tangent(points, i):
+    """Касательная в точке i: центральная разность, на концах – разность с соседом."""
+    if i == 0:
+        return (points[1][0] - points[0][0], points[1][1] - points[0][1])
+    if i == len(points) - 1:
+        return (points[-1][0] - points[-2][0], points[-1][1] - points[-2][1])
+    return ((points[i + 1][0] - points[i - 1][0]) * 0.5,
+            (points[i + 1][1] - points[i - 1][1]) * 0.5)
+
+
+def hermite_tangents(points):
+    """Касательные во всех точках (n, 2), см. hermite_tangent."""
+    points = np.asarray(points, dtype=float)
+    tangents = np.empty_like(points)
+    tangents[0] = points[1] - points[0]
+    tangents[1:-1] = (points[2:] - points[:-2]) * 0.5
+    tangents[-1] = points[-1] - points[-2]
+    return tangents
+
+
+def hermite_windows(points, tangents):
+    """Окна сегментов Эрмита (n - 1, 4, 2): P[i], T[i], P[i + 1], T[i + 1]."""
+    return np.stack((points[:-1], tangents[:-1], points[1:], tangents[1:]), axis=1)
+
+
+def bspline_windows(points):
+    """Окна сегментов B-сплайна (n - 3, 4, 2): P[i] .. P[i + 3]."""
+    return np.stack((points[:-3], points[1:-2], points[2:-1], points[3:]), axis=1)
+
+
+# Переход от окна сегмента к управляющим точкам кубической кривой Безье
+HERMITE_TO_BEZIER = np.array([[1, 0, 0, 0],
+                              [1, 1 / 3, 0, 0],
+                              [0, 0, 1, -1 / 3],
+                              [0, 0, 1, 0]])
+BSPLINE_TO_BEZIER = np.array([[1, 4, 1, 0],
+                              [0, 4, 2, 0],
+                              [0, 2, 4, 0],
+                              [0, 1, 4, 1]]) / 6.0
+
+# Наибольшая глубина деления сегмента (не больше 2 ** 16 отрезков на сегмент)
+MAX_SUBDIVISION_DEPTH = 16
+
+
+def bezier_flatness(curves):
+    """
+    Квадрат оценки отклонения кривых Безье (K, n + 1, 2) от их хорд.
+    Для кубических – оценка max((3 * P1 - 2 * P0 - P3) ** 2, (3 * P2 - P0 - 2 * P3) ** 2) / 16
+    по каждой координате. Для других степеней – наибольшее расстояние от управляющей точки P[i]
+    до точки хорды P[0] + i / n * (P[n] - P[0]): кривая – выпуклая комбинация этих разностей,
+    поэтому отклоняется от хорды не больше.
+    """
+    degree = curves.shape[1] - 1
+    if degree == 3:
+        b0, b1, b2, b3 = curves[:, 0], curves[:, 1], curves[:, 2], curves[:, 3]
+        u = (3 * b1 - 2 * b0 - b3) ** 2
+        v = (3 * b2 - b0 - 2 * b3) ** 2
+        return np.maximum(u, v).sum(axis=1) / 16
+    weights = (np.arange(degree + 1) / degree)[:, None]
+    chord = curves[:, :1] + weights * (curves[:, -1:] - curves[:, :1])
+    return ((curves - chord) ** 2).sum(axis=2).max(axis=1)
+
+
+def split_beziers(curves, t=0.5):
+    """Делит кривые Безье (K, n + 1, 2) в точке t по де Кастельжо: (левые, правые)."""
+    work = curves.copy()
+    degree = curves.shape[1] - 1
+    left = [curves[:, 0]]
+    right = [curves[:, degree]]
+    for r in range(1, degree + 1):
+        work[:, :degree - r + 1] = (1 - t) * work[:, :degree - r + 1] + t * work[:, 1:degree - r + 2]
+        left.append(work[:, 0].copy())
+        right.append(work[:, degree - r])
+    return np.stack(left, axis=1), np.stack(right[::-1], axis=1)
+
+
+def adaptive_bezier_points(curves, tolerance):
+    """
+    Адаптивное разбиение цепочки кривых Безье (K, n + 1, 2) на отрезки.
+    Все части одной глубины проверяются и делятся вместе.
+    Возвращает (ломаная (M, 2), число её точек на каждую кривую без конечной).
+    """
+    count = len(curves)
+    limit = tolerance ** 2
+    pending = curves
+    owner = np.arange(count)
+    start = np.zeros(count)
+    done_owner, done_start, done_points = [], [], []
+    for depth in range(MAX_SUBDIVISION_DEPTH + 1):
+        if len(pending) == 0:
+            break
+        flat = bezier_flatness(pending) <= limit
+        if depth == MAX_SUBDIVISION_DEPTH:
+            flat[:] = True
+        done_owner.append(owner[flat])
+        done_start.append(start[flat])
+        done_points.append(pending[flat, 0])
+        rest = ~flat
+        left, right = split_beziers(pending[rest])
+        pending = np.concatenate((left, right))
+        owner = np.concatenate((owner[rest], owner[rest]))
+        start = np.concatenate((start[rest], start[rest] + 0.5 ** (depth + 1)))
+    owner = np.concatenate(done_owner)
+    order = np.lexsort((np.concatenate(done_start), owner))
+    points = np.vstack((np.concatenate(done_points)[order], curves[-1, -1:]))
+    return points, np.bincount(owner, minlength=count)
+
+
+def evaluate_spans(basis, windows):
+    """Точки всех сегментов (S, steps + 1, 2) одним матричным произведением."""
+    return np.matmul(basis, windows)
+
+
+def join_spans(samples):
+    """Сегменты (S, steps + 1, 2) -> ломаная без повторения общих концов сегментов."""
+    return np.vstack((samples[:, :-1].reshape(-1, 2), samples[-1, -1:]))
+
+
+def hermite_curve_points(points, steps=SEGMENT_STEPS, tolerance=None):
 
     if len(points) < 2:
-        return []
-    n = len(points)
-    # Вычисление касательных
-    T = []
-    T.append((points[1][0] - points[0][0], points[1][1] - points[0][1]))
-    for i in range(1, n - 1):
-        tangent = ((points[i + 1][0] - points[i - 1][0]) * 0.5,
-                   (points[i + 1][1] - points[i - 1][1]) * 0.5)
-        T.append(tangent)
-    T.append((points[-1][0] - points[-2][0], points[-1][1] - points[-2][1]))
-
-    def hermite_basis(t):
-        h00 = 2 * t ** 3 - 3 * t ** 2 + 1
-        h10 = t ** 3 - 2 * t ** 2 + t
-        h01 = -2 * t ** 3 + 3 * t ** 2
-        h11 = t ** 3 - t ** 2
-        return h00, h10, h01, h11
-
-    segments = []
-    # Для каждого сегмента между точками
-    for i in range(n - 1):
-        segment_points = []
-        for step in range(21):
-            t = step / 20.0
-            h00, h10, h01, h11 = hermite_basis(t)
-            x = h00 * points[i][0] + h10 * T[i][0] + h01 * points[i + 1][0] + h11 * T[i + 1][0]
-            y = h00 * points[i][1] + h10 * T[i][1] + h01 * points[i + 1][1] + h11 * T[i + 1][1]
-            segment_points.append((x, y))
-        for j in range(len(segment_points) - 1):
-            segments.append((segment_points[j][0], segment_points[j][1],
-                             segment_points[j + 1][0], segment_points[j + 1][1]))
-    return segments
-
-
-def bezier_curve_segments(points):
+        return np.empty((0, 2))
+    points = np.asarray(points, dtype=float)
+    windows = hermite_windows(points, hermite_tangents(points))
+    if tolerance is not None:
+        return adaptive_bezier_points(np.matmul(HERMITE_TO_BEZIER, windows), tolerance)[0]
+    return join_spans(evaluate_spans(hermite_basis_matrix(steps), windows))
+
+
+def hermite_curve_segments(points, steps=SEGMENT_STEPS, tolerance=None):
+    return polyline_segments(hermite_curve_points(points, steps, tolerance))
+
+
+@lru_cache(maxsize=None)
+def binomial_coefficients(degree):
+    """Биномиальные коэффициенты C(degree, k), k = 0 .. degree."""
+    coefficients = np.array([math.comb(degree, k) for k in range(degree + 1)], dtype=float)
+    coefficients.setflags(write=False)
+    return coefficients
+
 
+@lru_cache(maxsize=None)
+def bernstein_matrix(degree, steps=BEZIER_STEPS):
+    """Матрица (steps + 1, degree + 1) многочленов Бернштейна при t = 0 .. 1."""
+    t = (np.arange(steps + 1) / steps)[:, None]
+    if degree <= BINOMIAL_MAX_DEGREE:
+        k = np.arange(degree + 1)
+        matrix = binomial_coefficients(degree) * t ** k * (1 - t) ** (degree - k)
+    else:
+        # b[k] степени r = (1 - t) * b[k] + t * b[k - 1] степени r - 1
+        matrix = np.zeros((steps + 1, degree + 1))
+        matrix[:, 0] = 1
+        for r in range(1, degree + 1):
+            matrix[:, 1:r + 1] = (1 - t) * matrix[:, 1:r + 1] + t * matrix[:, :r]
+            matrix[:, 0] *= 1 - t[:, 0]
+    matrix.setflags(write=False)
+    return matrix
+
+
+def elevate_degree(control):
+    """Повышение степени кривой Безье на единицу (та же кривая, на одну управляющую точку больше)."""
+    n = len(control)
+    alpha = (np.arange(1, n) / n)[:, None]
+    inner = alpha * control[:-1] + (1 - alpha) * control[1:]
+    return np.vstack((control[:1], inner, control[-1:]))
+
+
+def composite_cubics(points):
+    """
+    Кубические куски (K, 4, 2) составной кривой Безье: P[0..3], P[3..6], ...
+    Последний неполный кусок (прямая или квадратичная кривая) повышается до кубического.
+    """
+    pieces = (len(points) - 1) // 3
+    full = 3 * pieces
+    cubics = [np.stack((points[0:full:3], points[1:full:3], points[2:full:3], points[3:full + 1:3]), axis=1)]
+    tail = points[full:]
+    if len(tail) > 1:
+        while len(tail) < 4:
+            tail = elevate_degree(tail)
+        cubics.append(tail[None])
+    return np.concatenate(cubics)
+
+
+def bezier_curve_points(points, steps=None, tolerance=None, piecewise=None):
+    """
+    Кривая Безье по управляющим точкам points (степени len(points) - 1).
+    piecewise – строить составную кривую из кубических кусков; по умолчанию – при
+    len(points) >= PIECEWISE_MIN_POINTS. steps – число шагов на всю кривую
+    (BEZIER_STEPS) или на каждый кубический кусок (SEGMENT_STEPS).
+    """
     if len(points) < 2:
-        return []
+        return np.empty((0, 2))
+    points = np.asarray(points, dtype=float)
+    if piecewise is None:
+        piecewise = len(points) >= PIECEWISE_MIN_POINTS
+
+    if piecewise:
+        cubics = composite_cubics(points)
+        if tolerance is not None:
+            return adaptive_bezier_points(cubics, tolerance)[0]
+        return join_spans(evaluate_spans(bernstein_matrix(3, steps or SEGMENT_STEPS), cubics))
+
     if len(points) == 2:
-        return [(points[0][0], points[0][1], points[1][0], points[1][1])]
-
-    P0 = points[0]
-    P2 = points[-1]
-    n = len(points)
-    sum_x = sum(p[0] for p in points[1:-1])
-    sum_y = sum(p[1] for p in points[1:-1])
-    count = n - 2
-    C = (sum_x / count, sum_y / count)
-
-    segments = []
-    points_curve = []
-    for i in range(101):
-        t = i / 100.0
-        omt = 1 - t
-        x = (omt ** 2) * P0[0] + 2 * t * omt * C[0] + (t ** 2) * P2[0]
-        y = (omt ** 2) * P0[1] + 2 * t * omt * C[1] + (t ** 2) * P2[1]
-        points_curve.append((x, y))
-    for j in range(len(points_curve) - 1):
-        segments.append((points_curve[j][0], points_curve[j][1],
-                         points_curve[j + 1][0], points_curve[j + 1][1]))
-    return segments
-
-
-def bspline_curve_segments(points):
+        return points.copy()
+    if tolerance is not None:
+        return adaptive_bezier_points(points[None], tolerance)[0]
+    return bernstein_matrix(len(points) - 1, steps or BEZIER_STEPS) @ points
+
+
+def bezier_curve_segments(points, steps=None, tolerance=None, piecewise=None):
+    return polyline_segments(bezier_curve_points(points, steps, tolerance, piecewise))
+
+
+def bspline_curve_points(points, steps=SEGMENT_STEPS, tolerance=None):
 
     if len(points) < 4:
-        return []
-    segments = []
-    for i in range(len(points) - 3):
-        segment_points = []
-        for step in range(21):
-            t = step / 20.0
-            B0 = ((1 - t) ** 3) / 6.0
-            B1 = (3 * t ** 3 - 6 * t ** 2 + 4) / 6.0
-            B2 = (-3 * t ** 3 + 3 * t ** 2 + 3 * t + 1) / 6.0
-            B3 = (t ** 3) / 6.0
-            x = (B0 * points[i][0] +
-                 B1 * points[i + 1][0] +
-                 B2 * points[i + 2][0] +
-                 B3 * points[i + 3][0])
-            y = (B0 * points[i][1] +
-                 B1 * points[i + 1][1] +
-                 B2 * points[i + 2][1] +
-                 B3 * points[i + 3][1])
-            segment_points.append((x, y))
-        for j in range(len(segment_points) - 1):
-            segments.append((segment_points[j][0], segment_points[j][1],
-                             segment_points[j + 1][0], segment_points[j + 1][1]))
-    return segments
+        return np.empty((0, 2))
+    points = np.asarray(points, dtype=float)
+    windows = bspline_windows(points)
+    if tolerance is not None:
+        return adaptive_bezier_points(np.matmul(BSPLINE_TO_BEZIER, windows), tolerance)[0]
+    return join_spans(evaluate_spans(bspline_basis_matrix(steps), windows))
+
+
+def bspline_curve_segments(points, steps=SEGMENT_STEPS, tolerance=None):
+    return polyline_segments(bspline_curve_points(points, steps, tolerance))
@@ -0,0 +1,114 @@
+"""
+Модель кривой для редактора с кешем вычисленных сегментов.
+
+Кривая хранится плоским списком координат coords ([x0, y0, x1, y1, ...],
+как для canvas.coords). Каждый сегмент сплайна занимает в нём
+span_sizes[i] точек (без конечной – она начало следующего сегмента),
+в конце списка – последняя точка кривой. При равномерном разбиении
+span_sizes[i] == steps, при адаптивном (tolerance, пиксели) – сколько нужно сегменту.
+
+При перемещении одной опорной точки (move_point) пересчитываются только
+зависящие от неё сегменты:
+  - Эрмит: касательные точек index-1..index+1 и сегменты index-2..index+1;
+  - B-сплайн: сегменты index-3..index.
+Кривая Безье зависит от всех точек сразу и пересчитывается целиком.
+"""
+import numpy as np
+
+from curve_logic import (SEGMENT_STEPS, HERMITE_TO_BEZIER, BSPLINE_TO_BEZIER,
+                         hermite_basis_matrix, bspline_basis_matrix, hermite_tangent,
+                         hermite_tangents, hermite_windows, bspline_windows, evaluate_spans,
+                         join_spans, adaptive_bezier_points, bezier_curve_points, flatten_polyline)
+
+HERMITE = "Hermite"
+BEZIER = "Bezier"
+BSPLINE = "B-Spline"
+
+
+class CurveModel:
+    def __init__(self, kind=HERMITE, points=(), steps=SEGMENT_STEPS, tolerance=None):
+        self.kind = kind
+        self.steps = steps
+        self.tolerance = tolerance
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.tangents = None
+        self.coords = []
+        self.span_sizes = []
+        self.rebuild()
+
+    def set_tolerance(self, tolerance):
+        """Допуск адаптивного разбиения в пикселях; None – равномерное разбиение на steps шагов."""
+        if tolerance != self.tolerance:
+            self.tolerance = tolerance
+            self.rebuild()
+
+    def set_kind(self, kind):
+        if kind != self.kind:
+            self.kind = kind
+            self.rebuild()
+
+    def set_points(self, points):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.rebuild()
+
+    def span_count(self):
+        if self.kind == HERMITE:
+            return max(len(self.points) - 1, 0)
+        if self.kind == BSPLINE:
+            return max(len(self.points) - 3, 0)
+        return 0
+
+    def rebuild(self):
+        """Полный пересчёт кривой."""
+        if self.kind == BEZIER:
+            self.coords = flatten_polyline(bezier_curve_points(self.points, tolerance=self.tolerance))
+            return
+        n = self.span_count()
+        self.coords = []
+        self.span_sizes = [0] * n
+        if n:
+            if self.kind == HERMITE:
+                self.tangents = hermite_tangents(self.points)
+            self._update_spans(0, n - 1)
+
+    def move_point(self, index, point):
+        """Перемещает опорную точку index и пересчитывает только затронутые сегменты."""
+        self.points[index] = point
+        if self.kind == BEZIER:
+            self.rebuild()
+            return
+        n = self.span_count()
+        if n == 0:
+            return
+        if self.kind == HERMITE:
+            for i in range(max(index - 1, 0), min(index + 2, len(self.points))):
+                self.tangents[i] = hermite_tangent(self.points, i)
+            first, last = index - 2, index + 1
+        else:
+            first, last = index - 3, index
+        self._update_spans(max(first, 0), min(last, n - 1))
+
+    def _evaluate(self, first, last):
+        """Ломаная сегментов first..last и число её точек на каждый сегмент (без конечной)."""
+        if self.kind == HERMITE:
+            windows = hermite_windows(self.points[first:last + 2], self.tangents[first:last + 2])
+            basis, to_bezier = hermite_basis_matrix, HERMITE_TO_BEZIER
+        else:
+            windows = bspline_windows(self.points[first:last + 4])
+            basis, to_bezier = bspline_basis_matrix, BSPLINE_TO_BEZIER
+        if self.tolerance is not None:
+            polyline, sizes = adaptive_bezier_points(np.matmul(to_bezier, windows), self.tolerance)
+            return polyline, sizes.tolist()
+        return join_spans(evaluate_spans(basis(self.steps), windows)), [self.steps] * (last - first + 1)
+
+    def _update_spans(self, first, last):
+        """Пересчитывает сегменты first..last и подставляет их точки в coords."""
+        polyline, sizes = self._evaluate(first, last)
+        start = 2 * sum(self.span_sizes[:first])
+        if last == self.span_count() - 1:
+            # Последний сегмент записывает и конечную точку кривой
+            self.coords[start:] = flatten_polyline(polyline)
+        else:
+            end = start + 2 * sum(self.span_sizes[first:last + 1])
+            self.coords[start:end] = flatten_polyline(polyline[:-1])
+        self.span_sizes[first:last + 1] = sizes
@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox
-from curve_logic import hermite_curve_segments, bezier_curve_segments, bspline_curve_segments
+from curve_model import CurveModel
+
+# Допуск адаптивного разбиения кривых, пиксели
+ADAPTIVE_TOLERANCE = 0.5
 
 class CurveEditorApp:
     def __init__(self, master):
@@ -38,6 +41,11 @@ class CurveEditorApp:
                        variable=self.current_algo,
                        value="B-Spline", command=self.redraw_curve).pack(anchor="w", padx=5, pady=2)
 
+        # Адаптивное разбиение кривой: отрезков столько, чтобы отклонение было меньше полпикселя
+        self.adaptive = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.control_frame, text="Адаптивное разбиение",
+                       variable=self.adaptive, command=self.redraw_curve).pack(anchor="w", padx=5, pady=5)
+
         # Кнопка очистки холста
         self.btn_clear = tk.Button(self.control_frame, text="Очистить", width=15, command=self.clear_canvas)
         self.btn_clear.pack(pady=10)
@@ -51,6 +59,12 @@ class CurveEditorApp:
         self.point_ids = []     # id для овалов (точек)
         self.label_ids = []     # id для текстовых ярлыков (номеров)
 
+        # Кривая – один объект-ломаная на холсте, координаты которого обновляются через coords;
+        # вычисленные сегменты хранит модель кривой
+        self.curve_model = CurveModel(self.current_algo.get())
+        self.curve_id = None
+        self.debug_after_id = None
+
         # Данные для перетаскивания точки (drag and drop)
         self.drag_data = {"item": None, "x": 0, "y": 0, "index": None}
 
@@ -78,8 +92,11 @@ class CurveEditorApp:
         self.redraw_curve()
 
     def clear_canvas(self):
+        self.cancel_debug_draw()
         self.canvas.delete("all")
+        self.curve_id = None
         self.points = []
+        self.curve_model.set_points(self.points)
         self.point_ids = []
         self.label_ids = []
 
@@ -99,37 +116,48 @@ class CurveEditorApp:
         label_id = self.canvas.create_text(x + 10, y, text=str(len(self.points)),
                                             fill="black", font=("Arial", 10))
         self.label_ids.append(label_id)
+        self.curve_model.set_points(self.points)
         self.redraw_curve()
 
     def redraw_curve(self):
-        self.canvas.delete("curve")
+        self.cancel_debug_draw()
         algo = self.current_algo.get()
-        if algo == "Hermite":
-            segments = hermite_curve_segments(self.points)
-            color = "red"
-        elif algo == "Bezier":
-            segments = bezier_curve_segments(self.points)
-            color = "green"
-        elif algo == "B-Spline":
-            segments = bspline_curve_segments(self.points)
-            color = "blue"
+        self.curve_model.set_kind(algo)
+        self.curve_model.set_tolerance(ADAPTIVE_TOLERANCE if self.adaptive.get() else None)
+        color = {"Hermite": "red", "Bezier": "green", "B-Spline": "blue"}.get(algo, "black")
+        coords = self.curve_model.coords
+        if self.slow_draw:
+            self.debug_draw_segments(coords, color=color)
         else:
-            segments = []
-            color = "black"
+            self.set_curve_coords(coords, color)
 
-        if self.slow_draw:
-            self.debug_draw_segments(segments, color=color)
+    def set_curve_coords(self, coords, color):
+        """Обновляет ломаную кривой на холсте; для пустой кривой объект скрывается."""
+        if len(coords) < 4:
+            if self.curve_id is not None:
+                self.canvas.itemconfig(self.curve_id, state="hidden")
+            return
+        if self.curve_id is None:
+            self.curve_id = self.canvas.create_line(*coords, fill=color, width=2, tags="curve")
+            # Кривая под точками, чтобы не мешать их перетаскиванию
+            self.canvas.tag_lower(self.curve_id)
+        else:
+            self.canvas.coords(self.curve_id, coords)
+            self.canvas.itemconfig(self.curve_id, fill=color, state="normal")
+
+    def debug_draw_segments(self, coords, color, index=1):
+        # Каждый шаг добавляет к ломаной ещё один отрезок
+        if 2 * index < len(coords):
+            self.set_curve_coords(coords[:2 * index + 2], color)
+            self.debug_after_id = self.master.after(
+                100, lambda: self.debug_draw_segments(coords, color, index + 1))
         else:
-            for seg in segments:
-                self.canvas.create_line(seg[0], seg[1], seg[2], seg[3],
-                                        fill=color, width=2, tag="curve")
+            self.debug_after_id = None
 
-    def debug_draw_segments(self, segments, color, index=0):
-        if index < len(segments):
-            seg = segments[index]
-            self.canvas.create_line(seg[0], seg[1], seg[2], seg[3],
-                                    fill=color, width=2, tag="curve")
-            self.master.after(100, lambda: self.debug_draw_segments(segments, color, index+1))
+    def cancel_debug_draw(self):
+        if self.debug_after_id is not None:
+            self.master.after_cancel(self.debug_after_id)
+            self.debug_after_id = None
 
     def on_point_press(self, event):
         if not self.edit_mode:
@@ -158,6 +186,8 @@ class CurveEditorApp:
         label_id = self.label_ids[index]
         self.canvas.coords(label_id, new_x + 10, new_y)
         self.points[index] = (new_x, new_y)
+        # Пересчитываются только сегменты, зависящие от перемещённой точки
+        self.curve_model.move_point(index, (new_x, new_y))
         self.redraw_curve()
 
     def on_point_release(self, event):
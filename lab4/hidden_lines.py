@@ -0,0 +1,203 @@
+"""
+Удаление невидимых линий каркаса с помощью буфера глубины.
+
+Грани модели (треугольники) растеризуются в буфер глубины размером с холст,
+затем каждое ребро проходится с шагом около пикселя и остаются только те его
+части, которые не закрыты гранями. Вместо глубины хранится "близость" k:
+1 / w для перспективной проекции (w = z + d) и -z для ортогональной – обе
+величины линейны в экранных координатах, поэтому их можно интерполировать
+по треугольнику и по ребру; в буфере для каждого пикселя – наибольшая k.
+
+Грани, повёрнутые от камеры (по нормали (b - a) x (c - a), вершины обходятся
+против часовой стрелки, если смотреть снаружи), отбрасываются до растеризации,
+грани с вершинами ближе ближней плоскости – тоже.
+"""
+import numpy as np
+
+from transformation_logic import (NEAR_DISTANCE, frustum_planes, orthographic_planes, clip_edges,
+                                  project_points, project_points_orthographic)
+
+# Допуск сравнения глубины ребра с буфером: доля разброса k по вершинам растеризуемых граней
+DEPTH_TOLERANCE = 0.01
+# Наибольшее число пикселей-кандидатов, обрабатываемых за один проход растеризации
+RASTER_CHUNK = 1 << 22
+
+
+def as_triangle_array(triangles, vertex_count):
+    """Треугольники -> массив индексов (F, 3); треугольники с несуществующими вершинами отбрасываются."""
+    triangles = np.asarray(triangles, dtype=np.intp).reshape(-1, 3)
+    valid = ((triangles >= 0) & (triangles < vertex_count)).all(axis=1)
+    return np.ascontiguousarray(triangles[valid])
+
+
+def depth_keys(points, d=None):
+    """Близость k точек (N, 3|4) к камере: 1 / (z + d) для перспективы, -z для ортогональной (d=None)."""
+    if d is None:
+        return -points[:, 2]
+    return 1.0 / (points[:, 2] + d)
+
+
+def front_facing(points, triangles, d=None):
+    """Маска треугольников (F, 3), обращённых к камере (перспективной в z = -d или ортогональной)."""
+    a = points[triangles[:, 0], :3]
+    normals = np.cross(points[triangles[:, 1], :3] - a, points[triangles[:, 2], :3] - a)
+    if d is None:
+        return normals[:, 2] < 0
+    view = a.copy()
+    view[:, 2] += d  # вектор от камеры (0, 0, -d) к вершине
+    return (normals * view).sum(axis=1) < 0
+
+
+def rasterize_depth(screen, keys, triangles, width, height):
+    """
+    Буфер (height, width) наибольшей близости k по треугольникам с экранными вершинами screen (N, 2).
+    Пиксель покрыт, если его центр внутри треугольника. Для каждой строки треугольника
+    отрезок покрытых пикселей находится из трёх рёберных функций, k вдоль строки растёт
+    линейно. Пиксели всех треугольников обрабатываются вместе (частями не больше RASTER_CHUNK):
+    они сортируются по номеру пикселя, и наибольшая k каждого берётся через np.maximum.reduceat.
+    """
+    zbuffer = np.full(height * width, -np.inf)
+    if len(triangles) == 0:
+        return zbuffer.reshape(height, width)
+    a, b, c = screen[triangles[:, 0]], screen[triangles[:, 1]], screen[triangles[:, 2]]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    keep = area != 0
+    a, b, c, area, triangles = a[keep], b[keep], c[keep], area[keep], triangles[keep]
+    # Плоскость k = ka + k_dx * (x - ax) + k_dy * (y - ay)
+    ka, kb, kc = keys[triangles[:, 0]], keys[triangles[:, 1]], keys[triangles[:, 2]]
+    k_dx = ((kb - ka) * (c[:, 1] - a[:, 1]) - (kc - ka) * (b[:, 1] - a[:, 1])) / area
+    k_dy = ((kc - ka) * (b[:, 0] - a[:, 0]) - (kb - ka) * (c[:, 0] - a[:, 0])) / area
+
+    # Строки пикселей, центры которых (y + 0.5) попадают в треугольник по высоте
+    ys = np.stack((a[:, 1], b[:, 1], c[:, 1]))
+    y0 = np.clip(np.ceil(ys.min(axis=0) - 0.5), 0, height).astype(np.int64)
+    y1 = np.clip(np.floor(ys.max(axis=0) - 0.5), -1, height - 1).astype(np.int64)
+    rows = np.maximum(y1 - y0 + 1, 0)
+    owner = np.repeat(np.arange(len(rows)), rows)
+    py = y0[owner] + np.arange(len(owner)) - np.repeat(np.cumsum(rows) - rows, rows)
+    sy = py + 0.5
+
+    # Внутри треугольника s * E(x) >= 0 для рёберных функций E трёх рёбер, s – знак площади;
+    # на строке E(x) = alpha * x + beta, отсюда границы left <= x <= right
+    sign = np.sign(area)[owner]
+    left = np.full(len(owner), -np.inf)
+    right = np.full(len(owner), np.inf)
+    for p, q in ((a, b), (b, c), (c, a)):
+        px_, py_, qx, qy = p[owner, 0], p[owner, 1], q[owner, 0], q[owner, 1]
+        alpha = -(qy - py_) * sign
+        beta = ((qx - px_) * (sy - py_) + (qy - py_) * px_) * sign
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = -beta / alpha
+        left = np.where(alpha > 0, np.maximum(left, bound), left)
+        right = np.where(alpha < 0, np.minimum(right, bound), right)
+        right = np.where((alpha == 0) & (beta < 0), -np.inf, right)
+    x0 = np.clip(np.ceil(left - 0.5), 0, width).astype(np.int64)
+    x1 = np.clip(np.floor(right - 0.5), -1, width - 1).astype(np.int64)
+    counts = np.maximum(x1 - x0 + 1, 0)
+    # k в центре первого пикселя строки; дальше – шаг k_dx на пиксель
+    first_key = (ka[owner] + k_dx[owner] * (x0 + 0.5 - a[owner, 0]) + k_dy[owner] * (sy - a[owner, 1]))
+    row_step = k_dx[owner]
+    row_pixel = py * width + x0
+
+    selected = np.flatnonzero(counts)
+    cumulative = np.cumsum(counts[selected])
+    start = 0
+    while start < len(selected):
+        # Следующая часть – строки, в сумме дающие не больше RASTER_CHUNK пикселей (хотя бы одна)
+        limit = cumulative[start] - counts[selected[start]] + RASTER_CHUNK
+        end = max(int(np.searchsorted(cumulative, limit, side="right")), start + 1)
+        chunk = selected[start:end]
+        start = end
+        chunk_counts = counts[chunk]
+        row = np.repeat(chunk, chunk_counts)
+        offset = np.arange(len(row)) - np.repeat(np.cumsum(chunk_counts) - chunk_counts, chunk_counts)
+        pixel = row_pixel[row] + offset
+        k = first_key[row] + offset * row_step[row]
+        # Наибольшая k на пиксель: сортировка по номеру пикселя и максимум по группам
+        order = np.argsort(pixel)
+        pixel = pixel[order]
+        groups = np.flatnonzero(np.concatenate(([True], pixel[1:] != pixel[:-1])))
+        nearest = np.maximum.reduceat(k[order], groups)
+        pixel = pixel[groups]
+        zbuffer[pixel] = np.maximum(zbuffer[pixel], nearest)
+    return zbuffer.reshape(height, width)
+
+
+def min_filter(zbuffer):
+    """Наименьшая k по окрестности 3 x 3 каждого пикселя."""
+    rows = zbuffer.copy()
+    np.minimum(rows[1:], zbuffer[:-1], out=rows[1:])
+    np.minimum(rows[:-1], zbuffer[1:], out=rows[:-1])
+    result = rows.copy()
+    np.minimum(result[:, 1:], rows[:, :-1], out=result[:, 1:])
+    np.minimum(result[:, :-1], rows[:, 1:], out=result[:, :-1])
+    return result
+
+
+def visible_segments(start, end, start_keys, end_keys, zbuffer, tolerance):
+    """
+    Видимые части отрезков start -> end (экранные (M, 2), близость концов (M,)).
+    Отрезок проходится с шагом не больше пикселя; подряд идущие видимые точки
+    одного отрезка объединяются в отрезок. Возвращает (S, 4): x1, y1, x2, y2.
+    Точка сравнивается с наименьшей k в окрестности пикселя: ребро лежит на границе
+    своих граней, и буфер в соседних пикселях может быть ближе на шаг градиента грани
+    (особенно у граней, повёрнутых почти ребром к камере).
+    """
+    height, width = zbuffer.shape
+    if len(start) == 0:
+        return np.empty((0, 4))
+    length = np.hypot(*(end - start).T)
+    samples = np.ceil(length).astype(np.int64) + 1
+    owner = np.repeat(np.arange(len(start)), samples)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(samples) - samples, samples)
+    s = (step / np.maximum(samples[owner] - 1, 1))[:, None]
+    points = start[owner] + s * (end[owner] - start[owner])
+    keys = start_keys[owner] + s[:, 0] * (end_keys[owner] - start_keys[owner])
+    px = np.clip(points[:, 0].astype(np.int64), 0, width - 1)
+    py = np.clip(points[:, 1].astype(np.int64), 0, height - 1)
+    visible = keys >= min_filter(zbuffer)[py, px] - tolerance
+
+    # Границы серий видимых точек внутри одного отрезка
+    index = np.flatnonzero(visible)
+    if len(index) == 0:
+        return np.empty((0, 4))
+    breaks = np.flatnonzero((np.diff(index) != 1) | (np.diff(owner[index]) != 0)) + 1
+    first = index[np.concatenate(([0], breaks))]
+    last = index[np.concatenate((breaks - 1, [len(index) - 1]))]
+    segments = np.hstack((points[first], points[last]))
+    return segments[last > first]
+
+
+def hidden_line_segments(points, edges, triangles, width, height, center_x, center_y, d=None):
+    """
+    Видимые части рёбер модели (точки (N, 4) после преобразования) на холсте width x height.
+    d – расстояние проекции для перспективы, None – ортогональная проекция.
+    Возвращает экранные отрезки (S, 4).
+    """
+    if d is None:
+        planes = orthographic_planes(width, height, center_x, center_y)
+        project = lambda p: project_points_orthographic(p, center_x, center_y)
+    else:
+        planes = frustum_planes(d, width, height, center_x, center_y)
+        project = lambda p: project_points(p, d, center_x, center_y)
+    start, end, _ = clip_edges(points, edges, planes)
+
+    # Проецируются только вершины перед ближней плоскостью; грани с другими вершинами отбрасываются
+    if d is None:
+        in_front = np.ones(len(points), dtype=bool)
+    else:
+        in_front = points[:, 2] + d >= NEAR_DISTANCE
+        triangles = triangles[in_front[triangles].all(axis=1)]
+    triangles = triangles[front_facing(points, triangles, d)]
+    screen = np.zeros((len(points), 2))
+    keys = np.zeros(len(points))
+    screen[in_front] = project(points[in_front])
+    keys[in_front] = depth_keys(points[in_front], d)
+    zbuffer = rasterize_depth(screen, keys, triangles, width, height)
+
+    # Разброс k – только по вершинам растеризованных граней: вершина рядом с камерой
+    # (k = 1 / w очень велика) иначе сделала бы допуск огромным
+    used = np.unique(triangles)
+    tolerance = DEPTH_TOLERANCE * np.ptp(keys[used]) if len(used) else 0.0
+    return visible_segments(project(start), project(end), depth_keys(start, d), depth_keys(end, d),
+                            zbuffer, tolerance)
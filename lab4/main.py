@@ -1,6 +1,15 @@
 import tkinter as tk
+import numpy as np
 from tkinter import filedialog, messagebox
-from transformation_logic import read_model, apply_transformation, project_point, project_point_orthographic
+from transformation_logic import (to_homogeneous, as_edge_array, project_points, project_points_orthographic,
+                                  frustum_planes, orthographic_planes, clip_edges)
+from transform_stack import TransformStack
+from mesh_import import load_mesh
+from hidden_lines import as_triangle_array, hidden_line_segments
+from render_loop import RenderLoop, FrameStats
+
+# Подписи этапов кадра в статистике на холсте
+STAGE_LABELS = {"transform": "преобразование", "project": "проекция", "draw": "рисование"}
 
 
 class TransformationApp(tk.Tk):
@@ -11,16 +20,26 @@ class TransformationApp(tk.Tk):
 
         # Режим проекции (перспектива или ортографическая)
         self.projection_mode = tk.StringVar(value="perspective")
+        # Удаление невидимых линий (только для моделей с гранями – OBJ / PLY)
+        self.hide_lines = tk.BooleanVar(value=False)
 
         self.create_widgets()
 
         # Параметры проекции
         self.projection_distance = 500
 
-        # Модель: списки 3D точек и рёбер
-        self.model_points = []  # исходные 3D-координаты
-        self.model_edges = []  # пары индексов вершин
-        self.transformed_points = []  # точки после преобразования
+        # Модель: 3D точки (массив однородных координат (N, 4)) и рёбра
+        self.model_points = to_homogeneous([])  # исходные координаты
+        self.model_edges = as_edge_array([], 0)  # пары индексов вершин (M, 2)
+        self.model_triangles = np.empty((0, 3), dtype=np.intp)  # грани, разбитые на треугольники (F, 3)
+        self.edge_ids = []  # линии рёбер на холсте; переиспользуются между кадрами
+        self.shown_edges = 0  # сколько первых линий из edge_ids сейчас видимы
+        self.transformed_points = self.model_points.copy()  # точки после преобразования (буфер того же размера)
+        # Преобразование модели: параметры из полей и накопленный поворот с клавиатуры
+        self.transform = TransformStack()
+        # Перерисовка после ввода – не чаще раза в кадр; время этапов кадра выводится на холст
+        self.render_loop = RenderLoop(self, self.redraw_transformed)
+        self.frame_stats = FrameStats()
 
         # Загружаем модель из файла "cube.txt" (если файл найден)
         try:
@@ -43,6 +62,8 @@ class TransformationApp(tk.Tk):
         # Холст для рисования
         self.canvas = tk.Canvas(self.left_frame, bg="white")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.stats_id = self.canvas.create_text(10, 10, anchor=tk.NW, text="", fill="gray",
+                                                font=("Courier", 9))
 
         # Панель параметров
         header = tk.Label(self.right_frame, text="Параметры\nпреобразования", bg="lightgray",
@@ -109,6 +130,8 @@ class TransformationApp(tk.Tk):
                        value="perspective", bg="lightgray", command=self.draw_model).pack(side=tk.LEFT, padx=5)
         tk.Radiobutton(proj_frame, text="Ортогональная", variable=self.projection_mode,
                        value="ortho", bg="lightgray", command=self.draw_model).pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(self.right_frame, text="Скрывать невидимые линии", variable=self.hide_lines,
+                       bg="lightgray", command=self.draw_model).pack(anchor=tk.W, padx=10)
 
         # 5. Кнопки управления – разместим их в ряд
         btn_frame = tk.Frame(self.right_frame, bg="lightgray")
@@ -124,13 +147,16 @@ class TransformationApp(tk.Tk):
         # Информация по клавишам (в отдельном фрейме)
         info_frame = tk.Frame(self.right_frame, bg="lightgray")
         info_frame.pack(fill=tk.X, padx=10, pady=5)
-        info_text = "Клавиши: ←/→: поворот по Y, ↑/↓: поворот по X, Q/W: поворот по Z"
+        info_text = ("Клавиши: ←/→: поворот по Y, ↑/↓: поворот по X, Q/W: поворот по Z "
+                     "(добавляется к повороту из полей, сбрасывается кнопкой «Сброс»)")
         info = tk.Label(info_frame, text=info_text, bg="lightgray", justify=tk.LEFT, wraplength=280)
         info.pack(anchor=tk.W)
 
     def load_model_dialog(self):
         filename = tk.filedialog.askopenfilename(title="Выберите файл модели",
-                                                 filetypes=(("Text files", "*.txt"), ("Все файлы", "*.*")))
+                                                 filetypes=(("Модели", "*.txt *.obj *.ply"), ("Text files", "*.txt"),
+                                                            ("Wavefront OBJ", "*.obj"), ("PLY", "*.ply"),
+                                                            ("Все файлы", "*.*")))
         if filename:
             try:
                 self.load_model(filename)
@@ -138,10 +164,12 @@ class TransformationApp(tk.Tk):
                 messagebox.showerror("Ошибка", f"Ошибка при загрузке модели:\n{ex}")
 
     def load_model(self, filename):
-        points, edges = read_model(filename)
-        self.model_points = points
-        self.model_edges = edges
-        self.transformed_points = self.model_points.copy()
+        points, edges, triangles = load_mesh(filename, return_faces=True)
+        self.model_points = to_homogeneous(points)
+        self.model_edges = as_edge_array(edges, len(self.model_points))
+        self.model_triangles = as_triangle_array(triangles, len(self.model_points))
+        self.transformed_points = self.transform.apply(self.model_points)
+        self.release_edge_items(len(self.model_edges))
         self.draw_model()
 
     def apply_transformation(self):
@@ -182,10 +210,13 @@ class TransformationApp(tk.Tk):
         except:
             scale_z = 1.0
 
-        self.transformed_points = apply_transformation(self.model_points,
-                                                       dx, dy, dz,
-                                                       angle_x, angle_y, angle_z,
-                                                       scale_x, scale_y, scale_z)
+        self.transform.set_parameters(dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z)
+        self.render_loop.request()
+
+    def redraw_transformed(self):
+        # Точки модели преобразуются текущей матрицей в заранее выделенный буфер
+        with self.frame_stats.measure("transform"):
+            self.transform.apply(self.model_points, out=self.transformed_points)
         self.draw_model()
 
     def reset_model(self):
@@ -209,11 +240,12 @@ class TransformationApp(tk.Tk):
         self.sz_entry.delete(0, tk.END);
         self.sz_entry.insert(0, "1")
 
+        self.transform.reset()
+        self.render_loop.cancel()
         self.transformed_points = self.model_points.copy()
         self.draw_model()
 
     def draw_model(self):
-        self.canvas.delete("all")
         width = self.canvas.winfo_width()
         height = self.canvas.winfo_height()
         if width < 10 or height < 10:
@@ -221,70 +253,80 @@ class TransformationApp(tk.Tk):
         center_x = width / 2
         center_y = height / 2
 
-        for edge in self.model_edges:
-            i, j = edge
-            if i < len(self.transformed_points) and j < len(self.transformed_points):
-                p1 = self.transformed_points[i]
-                p2 = self.transformed_points[j]
-                if self.projection_mode.get() == "perspective":
-                    proj1 = project_point(p1, self.projection_distance, center_x, center_y)
-                    proj2 = project_point(p2, self.projection_distance, center_x, center_y)
-                else:
-                    proj1 = project_point_orthographic(p1, center_x, center_y)
-                    proj2 = project_point_orthographic(p2, center_x, center_y)
-                self.canvas.create_line(proj1[0], proj1[1], proj2[0], proj2[1],
-                                        fill="blue", width=2)
+        with self.frame_stats.measure("project"):
+            segments = self.project_edges(width, height, center_x, center_y)
+        with self.frame_stats.measure("draw"):
+            self.update_edge_items(segments)
+        self.frame_stats.frame_done()
+        self.canvas.itemconfig(self.stats_id, text=self.frame_stats.summary(STAGE_LABELS))
+
+    def project_edges(self, width, height, center_x, center_y):
+        """Экранные отрезки видимых рёбер: список [x1, y1, x2, y2]."""
+        if self.hide_lines.get() and len(self.model_triangles):
+            d = self.projection_distance if self.projection_mode.get() == "perspective" else None
+            segments = hidden_line_segments(self.transformed_points, self.model_edges, self.model_triangles,
+                                            width, height, center_x, center_y, d)
+            return segments.tolist()
+
+        # Рёбра отсекаются по видимой области до проекции: невидимые отбрасываются целиком,
+        # точки за камерой не проецируются
+        if self.projection_mode.get() == "perspective":
+            planes = frustum_planes(self.projection_distance, width, height, center_x, center_y)
+            start, end, _ = clip_edges(self.transformed_points, self.model_edges, planes)
+            start = project_points(start, self.projection_distance, center_x, center_y)
+            end = project_points(end, self.projection_distance, center_x, center_y)
+        else:
+            planes = orthographic_planes(width, height, center_x, center_y)
+            start, end, _ = clip_edges(self.transformed_points, self.model_edges, planes)
+            start = project_points_orthographic(start, center_x, center_y)
+            end = project_points_orthographic(end, center_x, center_y)
+        return np.hstack((start, end)).tolist()
+
+    def release_edge_items(self, count):
+        """Удаляет линии рёбер сверх count (например, оставшиеся от большой модели после загрузки новой)."""
+        surplus = self.edge_ids[count:]
+        if surplus:
+            self.canvas.delete(*surplus)
+            del self.edge_ids[count:]
+            self.shown_edges = min(self.shown_edges, count)
+
+    def update_edge_items(self, segments):
+        """
+        Переставляет линии рёбер через coords. Недостающие линии создаются,
+        лишние скрываются (а не удаляются) – число видимых рёбер меняется от кадра к кадру.
+        """
+        count = len(segments)
+        if len(self.edge_ids) < count:
+            while len(self.edge_ids) < count:
+                self.edge_ids.append(self.canvas.create_line(0, 0, 0, 0, fill="blue", width=2))
+            self.canvas.tag_raise(self.stats_id)  # статистика поверх новых линий
+        for item, segment in zip(self.edge_ids, segments):
+            self.canvas.coords(item, *segment)
+        for item in self.edge_ids[count:self.shown_edges]:
+            self.canvas.itemconfig(item, state="hidden")
+        for item in self.edge_ids[self.shown_edges:count]:
+            self.canvas.itemconfig(item, state="normal")
+        self.shown_edges = count
 
     def key_handler(self, event):
         step = 5  # шаг поворота в градусах
+        # Поля ввода не перечитываются: поворот накапливается в стеке преобразований,
+        # а перерисовка выполняется один раз за кадр, сколько бы нажатий ни пришло
         if event.keysym == "Left":
-            try:
-                current = float(self.ry_entry.get())
-            except:
-                current = 0
-            self.ry_entry.delete(0, tk.END)
-            self.ry_entry.insert(0, str(current - step))
-            self.apply_transformation()
+            self.transform.rotate("y", -step)
         elif event.keysym == "Right":
-            try:
-                current = float(self.ry_entry.get())
-            except:
-                current = 0
-            self.ry_entry.delete(0, tk.END)
-            self.ry_entry.insert(0, str(current + step))
-            self.apply_transformation()
+            self.transform.rotate("y", step)
         elif event.keysym == "Up":
-            try:
-                current = float(self.rx_entry.get())
-            except:
-                current = 0
-            self.rx_entry.delete(0, tk.END)
-            self.rx_entry.insert(0, str(current - step))
-            self.apply_transformation()
+            self.transform.rotate("x", -step)
         elif event.keysym == "Down":
-            try:
-                current = float(self.rx_entry.get())
-            except:
-                current = 0
-            self.rx_entry.delete(0, tk.END)
-            self.rx_entry.insert(0, str(current + step))
-            self.apply_transformation()
+            self.transform.rotate("x", step)
         elif event.char.lower() == "q":
-            try:
-                current = float(self.rz_entry.get())
-            except:
-                current = 0
-            self.rz_entry.delete(0, tk.END)
-            self.rz_entry.insert(0, str(current - step))
-            self.apply_transformation()
+            self.transform.rotate("z", -step)
         elif event.char.lower() == "w":
-            try:
-                current = float(self.rz_entry.get())
-            except:
-                current = 0
-            self.rz_entry.delete(0, tk.END)
-            self.rz_entry.insert(0, str(current + step))
-            self.apply_transformation()
+            self.transform.rotate("z", step)
+        else:
+            return
+        self.render_loop.request()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,315 @@
+"""
+Импорт сеток из Wavefront OBJ и PLY (ASCII и двоичного) в каркасную модель (points, edges)
+того же вида, что возвращает read_model: points (n, 3) float, edges (m, 2) int.
+
+Рёбра каркаса получаются из граней: каждая грань (i0, i1, ..., ik) даёт рёбра
+(i0, i1), ..., (ik, i0). Общие рёбра соседних граней убираются сортировкой
+концов ребра и сортировкой ключей min * n + max (как np.unique), без множеств Python.
+С return_faces=True загрузчики возвращают ещё и грани, разбитые на треугольники
+веером, – (points, edges, triangles (f, 3)); у текстовых моделей граней нет.
+
+  - load_mesh(filename, return_faces): выбор загрузчика по расширению (.obj, .ply, иначе read_model);
+  - read_obj(filename, return_faces), read_ply(filename, return_faces);
+  - polygon_edges(indices, counts, closed), unique_edges(edges, vertex_count);
+  - triangulate_polygons(indices, counts).
+"""
+import numpy as np
+
+from transformation_logic import read_model
+
+PLY_TYPES = {
+    "char": "i1", "int8": "i1", "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2", "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4", "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4", "double": "f8", "float64": "f8",
+}
+
+
+def polygon_edges(indices, counts, closed=True):
+    """
+    Рёбра многоугольников, записанных подряд: indices – вершины всех многоугольников,
+    counts – число вершин каждого. closed=False – ломаные (без ребра от последней к первой).
+    """
+    indices = np.asarray(indices, dtype=np.intp)
+    counts = np.asarray(counts, dtype=np.intp)
+    if len(indices) == 0:
+        return np.empty((0, 2), dtype=np.intp)
+    starts = np.cumsum(counts) - counts
+    following = np.arange(1, len(indices) + 1)
+    last = starts + counts - 1
+    if closed:
+        following[last] = starts
+        edges = np.column_stack((indices, indices[following]))
+    else:
+        keep = np.ones(len(indices), dtype=bool)
+        keep[last] = False
+        edges = np.column_stack((indices[keep], indices[following[keep]]))
+    return edges
+
+
+def unique_edges(edges, vertex_count):
+    """
+    Убирает повторы рёбер (в любом направлении), вырожденные рёбра (i, i) и рёбра
+    с индексами вне 0 .. vertex_count - 1; результат упорядочен.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    low = np.minimum(edges[:, 0], edges[:, 1])
+    high = np.maximum(edges[:, 0], edges[:, 1])
+    # Индексы вне диапазона нельзя упаковывать в ключ: они превратились бы в другие, допустимые рёбра
+    keep = (low != high) & (low >= 0) & (high < vertex_count)
+    keys = np.sort(low[keep] * vertex_count + high[keep])
+    # После сортировки одинаковые рёбра стоят рядом: оставляем первое из каждой группы
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = keys[1:] != keys[:-1]
+    keys = keys[first]
+    return np.column_stack((keys // vertex_count, keys % vertex_count)).astype(np.intp)
+
+
+def triangulate_polygons(indices, counts):
+    """Разбивает многоугольники, записанные подряд, на треугольники веером: (i0, ij, ij+1)."""
+    indices = np.asarray(indices, dtype=np.intp)
+    counts = np.asarray(counts, dtype=np.intp)
+    fans = np.maximum(counts - 2, 0)
+    if fans.sum() == 0:
+        return np.empty((0, 3), dtype=np.intp)
+    starts = np.cumsum(counts) - counts
+    first = np.repeat(starts, fans)
+    # Номер треугольника внутри своего многоугольника: 0 .. fans - 1
+    local = np.arange(len(first)) - np.repeat(np.cumsum(fans) - fans, fans)
+    return np.column_stack((indices[first], indices[first + local + 1], indices[first + local + 2]))
+
+
+def _obj_index(token, vertex_count):
+    # "v", "v/vt", "v//vn", "v/vt/vn"; индексы с 1, отрицательные – от конца списка
+    index = int(token.split("/", 1)[0])
+    if index > 0:
+        return index - 1
+    if index == 0 or -index > vertex_count:
+        raise ValueError(f"Файл OBJ: индекс вершины {index} вне списка из {vertex_count} вершин")
+    return vertex_count + index
+
+
+def read_obj(filename, return_faces=False):
+    """Wavefront OBJ: вершины v, грани f и ломаные l. Файл читается построчно."""
+    vertices = []
+    face_indices, face_counts = [], []
+    line_indices, line_counts = [], []
+    with open(filename, "r") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            kind = parts[0]
+            if kind == "v":
+                vertices.append(parts[1:4])
+            elif kind == "f" or kind == "l":
+                count = len(vertices)
+                polygon = [_obj_index(token, count) for token in parts[1:]]
+                if kind == "f":
+                    face_indices.extend(polygon)
+                    face_counts.append(len(polygon))
+                else:
+                    line_indices.extend(polygon)
+                    line_counts.append(len(polygon))
+    points = np.array(vertices, dtype=float).reshape(-1, 3)
+    edges = np.vstack((polygon_edges(face_indices, face_counts, closed=True),
+                       polygon_edges(line_indices, line_counts, closed=False)))
+    edges = unique_edges(edges, max(len(points), 1))
+    if return_faces:
+        return points, edges, triangulate_polygons(face_indices, face_counts)
+    return points, edges
+
+
+def _read_ply_header(f):
+    """Заголовок PLY: (формат, [(имя элемента, число, [(свойство, тип)])]), тип – строка или ("list", тип числа, тип элемента)."""
+    if f.readline().strip() != b"ply":
+        raise ValueError("Файл не является файлом PLY")
+    file_format = None
+    elements = []
+    while True:
+        line = f.readline()
+        if not line:
+            raise ValueError("Файл PLY: не найден конец заголовка")
+        parts = line.decode("ascii").split()
+        if not parts or parts[0] in ("comment", "obj_info"):
+            continue
+        if parts[0] == "end_header":
+            break
+        if parts[0] == "format":
+            file_format = parts[1]
+        elif parts[0] == "element":
+            elements.append((parts[1], int(parts[2]), []))
+        elif parts[0] == "property":
+            if parts[1] == "list":
+                elements[-1][2].append((parts[4], ("list", PLY_TYPES[parts[2]], PLY_TYPES[parts[3]])))
+            else:
+                elements[-1][2].append((parts[2], PLY_TYPES[parts[1]]))
+    if file_format not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"Файл PLY: неизвестный формат {file_format}")
+    return file_format, elements
+
+
+def _ply_row_dtype(properties, order, list_lengths):
+    """Тип строки элемента с заданными длинами списков."""
+    fields = []
+    for (name, kind), length in zip(properties, list_lengths):
+        if isinstance(kind, tuple):
+            fields.append((name + "_count", order + kind[1]))
+            fields.append((name, order + kind[2], (length,)))
+        else:
+            fields.append((name, order + kind))
+    return np.dtype(fields)
+
+
+def _empty_ply_element(properties):
+    """Элемент без записей: пустые столбцы, для списков – пара (индексы, длины)."""
+    return {name: (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)) if isinstance(kind, tuple)
+            else np.empty(0) for name, kind in properties}
+
+
+def _read_ply_binary_element(data, offset, count, properties, order):
+    """
+    Читает элемент двоичного PLY с позиции offset; возвращает (словарь свойств, новая позиция).
+    Списки одинаковой длины (обычно все грани – треугольники) читаются одним frombuffer;
+    иначе элемент разбирается построчно, а списки возвращаются как (индексы подряд, длины).
+    """
+    lists = [kind for _, kind in properties if isinstance(kind, tuple)]
+    if count == 0:
+        return _empty_ply_element(properties), offset
+    if not lists:
+        dtype = _ply_row_dtype(properties, order, [None] * len(properties))
+        rows = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        return {name: rows[name] for name, _ in properties}, offset + count * dtype.itemsize
+    # Предполагаем, что длины списков у всех строк такие же, как у первой, и проверяем это
+    lengths, position = [], offset
+    for name, kind in properties:
+        if isinstance(kind, tuple):
+            length = int(np.frombuffer(data, dtype=order + kind[1], count=1, offset=position)[0])
+            lengths.append(length)
+            position += np.dtype(kind[1]).itemsize + length * np.dtype(kind[2]).itemsize
+        else:
+            lengths.append(None)
+            position += np.dtype(kind).itemsize
+    dtype = _ply_row_dtype(properties, order, lengths)
+    if offset + count * dtype.itemsize <= len(data):
+        rows = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        if all(np.all(rows[name + "_count"] == length)
+               for (name, kind), length in zip(properties, lengths) if isinstance(kind, tuple)):
+            result = {}
+            for (name, kind), length in zip(properties, lengths):
+                if isinstance(kind, tuple):
+                    result[name] = (rows[name].reshape(-1), np.full(count, length))
+                else:
+                    result[name] = rows[name]
+            return result, offset + count * dtype.itemsize
+    # Списки разной длины: построчный разбор
+    columns = {name: ([], []) if isinstance(kind, tuple) else [] for name, kind in properties}
+    for _ in range(count):
+        for name, kind in properties:
+            if isinstance(kind, tuple):
+                count_type, item_type = np.dtype(order + kind[1]), np.dtype(order + kind[2])
+                length = int(np.frombuffer(data, dtype=count_type, count=1, offset=offset)[0])
+                offset += count_type.itemsize
+                columns[name][0].append(np.frombuffer(data, dtype=item_type, count=length, offset=offset))
+                columns[name][1].append(length)
+                offset += length * item_type.itemsize
+            else:
+                value_type = np.dtype(order + kind)
+                columns[name].append(np.frombuffer(data, dtype=value_type, count=1, offset=offset)[0])
+                offset += value_type.itemsize
+    result = {}
+    for name, kind in properties:
+        if isinstance(kind, tuple):
+            items, lengths = columns[name]
+            result[name] = (np.concatenate(items), np.array(lengths))
+        else:
+            result[name] = np.array(columns[name])
+    return result, offset
+
+
+def _read_ply_ascii_element(lines, count, properties):
+    """Читает элемент ASCII PLY из строк lines (по строке на запись)."""
+    lists = [kind for _, kind in properties if isinstance(kind, tuple)]
+    if count == 0:
+        return _empty_ply_element(properties)
+    if not lists:
+        values = np.fromstring(" ".join(lines), sep=" ").reshape(count, len(properties))
+        return {name: values[:, k] for k, (name, _) in enumerate(properties)}
+    if len(properties) == 1:
+        # Частый случай: элемент из одного списка (грани); строки одинаковой длины – одним массивом
+        name = properties[0][0]
+        first = len(lines[0].split())
+        values = np.fromstring(" ".join(lines), sep=" ")
+        if len(values) == count * first:
+            values = values.reshape(count, first)
+            if np.all(values[:, 0] == first - 1):
+                return {name: (values[:, 1:].astype(np.intp).reshape(-1), np.full(count, first - 1))}
+    columns = {name: ([], []) if isinstance(kind, tuple) else [] for name, kind in properties}
+    for line in lines:
+        tokens = line.split()
+        position = 0
+        for name, kind in properties:
+            if isinstance(kind, tuple):
+                length = int(tokens[position])
+                columns[name][0].extend(int(token) for token in tokens[position + 1:position + 1 + length])
+                columns[name][1].append(length)
+                position += 1 + length
+            else:
+                columns[name].append(float(tokens[position]))
+                position += 1
+    return {name: (np.array(value[0], dtype=np.intp), np.array(value[1], dtype=np.intp))
+            if isinstance(kind, tuple) else np.array(value)
+            for (name, kind), value in zip(properties, columns.values())}
+
+
+def read_ply(filename, return_faces=False):
+    """PLY (ascii, binary_little_endian, binary_big_endian): вершины x, y, z, грани и элемент edge."""
+    with open(filename, "rb") as f:
+        file_format, elements = _read_ply_header(f)
+        data = f.read()
+    values = {}
+    if file_format == "ascii":
+        lines = [line for line in data.decode("ascii").splitlines() if line.strip()]
+        position = 0
+        for name, count, properties in elements:
+            values[name] = _read_ply_ascii_element(lines[position:position + count], count, properties)
+            position += count
+    else:
+        order = "<" if file_format == "binary_little_endian" else ">"
+        offset = 0
+        for name, count, properties in elements:
+            values[name], offset = _read_ply_binary_element(data, offset, count, properties, order)
+
+    vertex = values.get("vertex")
+    if vertex is None:
+        raise ValueError("Файл PLY не содержит вершин")
+    points = np.column_stack((vertex["x"], vertex["y"], vertex["z"])).astype(float)
+    edges = [np.empty((0, 2), dtype=np.intp)]
+    triangles = np.empty((0, 3), dtype=np.intp)
+    face = values.get("face", {})
+    for name in ("vertex_indices", "vertex_index"):
+        if name in face:
+            indices, counts = face[name]
+            edges.append(polygon_edges(indices, counts, closed=True))
+            triangles = triangulate_polygons(indices, counts)
+            break
+    edge = values.get("edge")
+    if edge is not None and "vertex1" in edge:
+        edges.append(np.column_stack((edge["vertex1"], edge["vertex2"])).astype(np.intp))
+    edges = unique_edges(np.vstack(edges), max(len(points), 1))
+    if return_faces:
+        return points, edges, triangles
+    return points, edges
+
+
+def load_mesh(filename, return_faces=False):
+    """Загружает модель в зависимости от расширения файла: .obj, .ply или текстовый формат read_model."""
+    extension = filename.lower().rsplit(".", 1)[-1]
+    if extension == "obj":
+        return read_obj(filename, return_faces)
+    if extension == "ply":
+        return read_ply(filename, return_faces)
+    points, edges = read_model(filename)
+    if return_faces:
+        return points, edges, np.empty((0, 3), dtype=np.intp)
+    return points, edges
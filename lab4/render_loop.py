@@ -0,0 +1,81 @@
+"""
+Цикл отрисовки по таймеру Tk с ограничением частоты кадров.
+
+События ввода (например, автоповтор клавиш) приходят чаще, чем имеет смысл
+перерисовывать. Обработчик только меняет состояние модели (поворот
+накапливается в TransformStack) и вызывает RenderLoop.request(); кадр
+выполняется через widget.after не чаще fps раз в секунду, поэтому все
+изменения, накопившиеся между кадрами, дают одно преобразование и одну
+перерисовку. Когда изменений нет, таймер не работает.
+
+FrameStats собирает время этапов кадра для вывода на холст.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+
+FRAME_RATE = 60     # целевая частота кадров
+STATS_WINDOW = 30   # по скольким последним кадрам усредняется время этапов
+
+
+class RenderLoop:
+    """Выполняет render() по запросу, не чаще fps раз в секунду."""
+
+    def __init__(self, widget, render, fps=FRAME_RATE):
+        self.widget = widget
+        self.render = render
+        self.interval = 1.0 / fps
+        self.after_id = None
+        self.last_frame = -float("inf")
+
+    def request(self):
+        """Запрашивает кадр; повторные запросы до его выполнения объединяются."""
+        if self.after_id is not None:
+            return
+        delay = self.last_frame + self.interval - time.perf_counter()
+        self.after_id = self.widget.after(int(max(0.0, delay) * 1000), self._tick)
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        self.after_id = None
+        self.last_frame = time.perf_counter()
+        self.render()
+
+
+class FrameStats:
+    """Время этапов кадра (мс), усреднённое по последним window кадрам, и число кадров в секунду."""
+
+    def __init__(self, stages=("transform", "project", "draw"), window=STATS_WINDOW):
+        self.stages = stages
+        self.samples = {stage: deque(maxlen=window) for stage in stages}
+        self.frames = deque()  # моменты окончания кадров за последнюю секунду
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[stage].append(time.perf_counter() - started)
+
+    def frame_done(self):
+        now = time.perf_counter()
+        self.frames.append(now)
+        while self.frames[0] < now - 1.0:
+            self.frames.popleft()
+
+    def average(self, stage):
+        """Среднее время этапа stage в миллисекундах."""
+        samples = self.samples[stage]
+        return 1000 * sum(samples) / len(samples) if samples else 0.0
+
+    def summary(self, labels=None):
+        """Текст для вывода: кадры в секунду и среднее время каждого этапа."""
+        labels = labels or {}
+        lines = [f"{len(self.frames)} кадр/с"]
+        lines += [f"{labels.get(stage, stage)}: {self.average(stage):.2f} мс" for stage in self.stages]
+        return "\n".join(lines)
@@ -0,0 +1,66 @@
+"""
+Стек преобразований модели с кешем: M = T * Q * Rz * Ry * Rx * S.
+
+T, Rz, Ry, Rx, S задаются параметрами (как в build_transformation_matrix),
+их матрицы берутся из кеша по значениям параметров, а произведение
+Rz * Ry * Rx * S пересчитывается только при изменении углов или масштаба.
+Q – накопленный поворот с клавиатуры, хранится кватернионом: шаги
+поворота перемножаются и нормируются, поэтому матрица не теряет
+ортогональность. Шаг поворота стоит одного умножения 4 x 4.
+"""
+from transformation_logic import (scale_matrix, rotation_x_matrix, rotation_y_matrix,
+                                  rotation_z_matrix, IDENTITY_QUATERNION, quaternion_from_axis_angle,
+                                  quaternion_multiply, quaternion_normalize, quaternion_matrix,
+                                  transform_points)
+
+AXES = {"x": (1, 0, 0), "y": (0, 1, 0), "z": (0, 0, 1)}
+
+
+class TransformStack:
+    def __init__(self):
+        self.translation = (0.0, 0.0, 0.0)
+        self.angles = (0.0, 0.0, 0.0)
+        self.scales = (1.0, 1.0, 1.0)
+        self.orientation = IDENTITY_QUATERNION
+        self._inner = None   # Rz * Ry * Rx * S
+        self._matrix = None  # итоговая матрица M
+
+    def set_parameters(self, dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z):
+        """Задаёт параметры T, R, S; неизменившиеся части не пересчитываются."""
+        translation = (dx, dy, dz)
+        if translation != self.translation:
+            self.translation = translation
+            self._matrix = None
+        angles = (angle_x, angle_y, angle_z)
+        scales = (scale_x, scale_y, scale_z)
+        if angles != self.angles or scales != self.scales:
+            self.angles = angles
+            self.scales = scales
+            self._inner = None
+            self._matrix = None
+
+    def rotate(self, axis, angle):
+        """Добавляет поворот на angle градусов вокруг мировой оси axis ("x", "y", "z" или вектор)."""
+        step = quaternion_from_axis_angle(AXES.get(axis, axis), angle)
+        self.orientation = quaternion_normalize(quaternion_multiply(step, self.orientation))
+        self._matrix = None
+
+    def reset(self):
+        self.__init__()
+
+    @property
+    def matrix(self):
+        if self._inner is None:
+            angle_x, angle_y, angle_z = self.angles
+            self._inner = (rotation_z_matrix(angle_z) @ rotation_y_matrix(angle_y)
+                           @ rotation_x_matrix(angle_x) @ scale_matrix(*self.scales))
+        if self._matrix is None:
+            # T * X для X без смещения – это X с подставленным столбцом смещения
+            M = quaternion_matrix(self.orientation) @ self._inner
+            M[:3, 3] = self.translation
+            self._matrix = M
+        return self._matrix
+
+    def apply(self, points, out=None):
+        """Преобразует точки (N, 4) текущей матрицей; out – буфер для результата."""
+        return transform_points(points, self.matrix, out=out)
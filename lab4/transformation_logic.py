@@ -1,95 +1,241 @@
 import math
+import os
+from functools import lru_cache
+
 import numpy as np
 
 
-def read_model(filename):
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-    clean_lines = []
-    for line in lines:
-        l = line.strip()
-        if l and not l.startswith('#'):
-            clean_lines.append(l)
-    if not clean_lines:
+# Модели размером от CACHE_MIN_BYTES при первой загрузке сохраняются рядом с текстовым
+# файлом в двоичном виде (<файл>.points.npy и <файл>.edges.npy). Следующие загрузки
+# отображают эти файлы в память (mmap) и не разбирают текст. В <файл>.source.npy
+# записываются размер и время изменения текстового файла, по которым был построен кеш:
+# кеш используется, только если они совпадают точно (файл, заменённый более старым, –
+# например, скопированный с сохранением времени, – тоже приводит к новому разбору).
+CACHE_MIN_BYTES = 1 << 20
+
+
+def _cache_paths(filename):
+    return filename + ".points.npy", filename + ".edges.npy"
+
+
+def _source_stamp(filename):
+    info = os.stat(filename)
+    return np.array([info.st_size, info.st_mtime_ns], dtype=np.int64)
+
+
+def _load_cached_model(filename):
+    """Модель из двоичного кеша или None, если кеша нет или он построен по другой версии файла."""
+    try:
+        if not np.array_equal(np.load(filename + ".source.npy"), _source_stamp(filename)):
+            return None
+        return tuple(np.load(path, mmap_mode="r") for path in _cache_paths(filename))
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_model(filename, points, edges, stamp):
+    try:
+        for path, array in zip(_cache_paths(filename), (points, edges)):
+            np.save(path, array)
+        # Отметка пишется последней: недописанный кеш не будет принят
+        np.save(filename + ".source.npy", stamp)
+    except OSError:
+        pass  # кеш необязателен: например, папка модели только для чтения
+
+
+def _parse_rows(lines, columns, dtype, message):
+    """Первые columns чисел каждой строки lines -> массив (len(lines), columns); остальное в строке (и комментарий после #) пропускается."""
+    if not lines:
+        return np.empty((0, columns), dtype=dtype)
+    try:
+        return np.loadtxt(lines, dtype=dtype, usecols=range(columns), comments="#", ndmin=2)
+    except ValueError:
+        raise ValueError(message) from None
+
+
+def parse_model(text):
+    """
+    Разбирает текст модели: число вершин n, n строк "x y z", число рёбер m, m строк "i j".
+    Пустые строки и строки-комментарии (начинаются с #) пропускаются; лишние числа
+    в конце строки и комментарии после # игнорируются.
+    Возвращает (points (n, 3) float, edges (m, 2) int).
+    """
+    lines = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    if not lines:
         raise ValueError("Файл модели пуст или имеет неверный формат")
+    try:
+        n = int(lines[0].split()[0])
+        m = int(lines[n + 1].split()[0]) if len(lines) > n + 1 else None
+    except ValueError:
+        raise ValueError("Файл модели имеет неверный формат: число вершин или рёбер не целое") from None
+    if m is None:
+        raise ValueError("Файл модели имеет неверный формат: не хватает вершин или числа рёбер")
+    if len(lines) < n + 2 + m:
+        raise ValueError("Файл модели имеет неверный формат: не хватает рёбер")
+    points = _parse_rows(lines[1:n + 1], 3, float, "Файл модели имеет неверный формат: ошибка в строке вершины")
+    edges = _parse_rows(lines[n + 2:n + 2 + m], 2, np.intp, "Файл модели имеет неверный формат: ошибка в строке ребра")
+    return points, edges
 
-    n = int(clean_lines[0])
-    points = []
-    for i in range(1, n + 1):
-        parts = clean_lines[i].split()
-        points.append((float(parts[0]), float(parts[1]), float(parts[2])))
-    m = int(clean_lines[n + 1])
-    edges = []
-    for i in range(n + 2, n + 2 + m):
-        parts = clean_lines[i].split()
-        edges.append((int(parts[0]), int(parts[1])))
+
+def read_model(filename, use_cache=True):
+    """Загружает модель: (points (n, 3), edges (m, 2)); большие модели кешируются (см. CACHE_MIN_BYTES)."""
+    if use_cache:
+        cached = _load_cached_model(filename)
+        if cached is not None:
+            return cached
+    stamp = _source_stamp(filename)  # до чтения: изменение файла во время разбора не попадёт в кеш
+    with open(filename, 'r') as f:
+        points, edges = parse_model(f.read())
+    if use_cache and stamp[0] >= CACHE_MIN_BYTES:
+        _save_cached_model(filename, points, edges, stamp)
     return points, edges
 
 
-def build_transformation_matrix(dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z):
-    # Перевод углов в радианы
-    ax = math.radians(angle_x)
-    ay = math.radians(angle_y)
-    az = math.radians(angle_z)
+# Матрицы отдельных преобразований кешируются по своим параметрам и доступны только для чтения
 
+def _frozen(matrix):
+    matrix = np.array(matrix, dtype=float)
+    matrix.setflags(write=False)
+    return matrix
+
+
+@lru_cache(maxsize=256)
+def scale_matrix(scale_x, scale_y, scale_z):
     # Матрица масштабирования S
-    S = np.array([
+    return _frozen([
         [scale_x, 0, 0, 0],
         [0, scale_y, 0, 0],
         [0, 0, scale_z, 0],
         [0, 0, 0, 1]
     ])
 
-    # Матрица поворота вокруг X: Rx
-    Rx = np.array([
+
+@lru_cache(maxsize=256)
+def rotation_x_matrix(angle_x):
+    # Матрица поворота вокруг X: Rx (угол в градусах)
+    ax = math.radians(angle_x)
+    return _frozen([
         [1, 0, 0, 0],
         [0, math.cos(ax), -math.sin(ax), 0],
         [0, math.sin(ax), math.cos(ax), 0],
         [0, 0, 0, 1]
     ])
 
+
+@lru_cache(maxsize=256)
+def rotation_y_matrix(angle_y):
     # Матрица поворота вокруг Y: Ry
-    Ry = np.array([
+    ay = math.radians(angle_y)
+    return _frozen([
         [math.cos(ay), 0, math.sin(ay), 0],
         [0, 1, 0, 0],
         [-math.sin(ay), 0, math.cos(ay), 0],
         [0, 0, 0, 1]
     ])
 
+
+@lru_cache(maxsize=256)
+def rotation_z_matrix(angle_z):
     # Матрица поворота вокруг Z: Rz
-    Rz = np.array([
+    az = math.radians(angle_z)
+    return _frozen([
         [math.cos(az), -math.sin(az), 0, 0],
         [math.sin(az), math.cos(az), 0, 0],
         [0, 0, 1, 0],
         [0, 0, 0, 1]
     ])
 
+
+@lru_cache(maxsize=256)
+def translation_matrix(dx, dy, dz):
     # Матрица смещения T
-    T = np.array([
+    return _frozen([
         [1, 0, 0, dx],
         [0, 1, 0, dy],
         [0, 0, 1, dz],
         [0, 0, 0, 1]
     ])
 
+
+def build_transformation_matrix(dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z):
     # Композиция преобразований:
     # M = T * Rz * Ry * Rx * S
-    M = T @ Rz @ Ry @ Rx @ S
+    M = (translation_matrix(dx, dy, dz) @ rotation_z_matrix(angle_z) @ rotation_y_matrix(angle_y)
+         @ rotation_x_matrix(angle_x) @ scale_matrix(scale_x, scale_y, scale_z))
     return M
 
 
-def apply_transformation(points, dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z):
+# Кватернионы (w, x, y, z) для накопления поворотов без потери ортогональности
+
+IDENTITY_QUATERNION = (1.0, 0.0, 0.0, 0.0)
+
+
+def quaternion_from_axis_angle(axis, angle):
+    """Кватернион поворота на angle градусов вокруг оси axis (x, y, z)."""
+    x, y, z = axis
+    length = math.sqrt(x * x + y * y + z * z)
+    half = math.radians(angle) / 2
+    k = math.sin(half) / length
+    return (math.cos(half), x * k, y * k, z * k)
+
+
+def quaternion_multiply(q1, q2):
+    """Произведение q1 * q2: сначала поворот q2, затем q1."""
+    w1, x1, y1, z1 = q1
+    w2, x2, y2, z2 = q2
+    return (w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+            w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+            w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+            w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2)
+
+
+def quaternion_normalize(q):
+    norm = math.sqrt(sum(c * c for c in q))
+    return tuple(c / norm for c in q)
+
+
+def quaternion_matrix(q):
+    """Матрица поворота 4 x 4 для единичного кватерниона q."""
+    w, x, y, z = q
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y), 0],
+        [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x), 0],
+        [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y), 0],
+        [0, 0, 0, 1]
+    ])
+
+
+def to_homogeneous(points):
+    """Точки (N, 3) -> непрерывный массив однородных координат (N, 4) с w = 1."""
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 2 and points.shape[1] == 4:
+        return np.ascontiguousarray(points)
+    points = points.reshape(-1, 3)
+    homogeneous = np.ones((len(points), 4))
+    homogeneous[:, :3] = points
+    return homogeneous
+
+
+def transform_points(points, M, out=None):
+    """
+    Применяет матрицу M (4 x 4) ко всем точкам (N, 4) одним матричным умножением.
+    Строки – векторы-строки, поэтому points @ M.T. Если задан out (N, 4), результат
+    записывается в него (можно out=points – преобразование на месте).
+    """
+    return np.matmul(points, M.T, out=out)
+
+
+def apply_transformation(points, dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z, out=None):
+    """
+    Преобразует точки модели: (N, 4) массив однородных координат или список (x, y, z).
+    Возвращает массив (N, 4); out – необязательный заранее выделенный буфер (N, 4) для результата.
+    """
     M = build_transformation_matrix(dx, dy, dz, angle_x, angle_y, angle_z, scale_x, scale_y, scale_z)
-    transformed_points = []
-    for (x, y, z) in points:
-        vec = np.array([x, y, z, 1])
-        new_vec = M @ vec  # матричное умножение
-        transformed_points.append((new_vec[0], new_vec[1], new_vec[2]))
-    return transformed_points
+    return transform_points(to_homogeneous(points), M, out=out)
 
 
 def project_point(point, d, center_x, center_y):
-    x, y, z = point
+    x, y, z = point[:3]
     factor = d / (z + d) if (z + d) != 0 else d
     x_proj = center_x + x * factor
     y_proj = center_y - y * factor  # инвертируем y, так как в Canvas ось Y растёт вниз
@@ -97,8 +243,103 @@ def project_point(point, d, center_x, center_y):
 
 
 def project_point_orthographic(point, center_x, center_y):
-    x, y, z = point
+    x, y, z = point[:3]
     return (center_x + x, center_y - y)
 
 
+def project_points(points, d, center_x, center_y):
+    """Перспективная проекция всех точек (N, 3) или (N, 4) сразу -> (N, 2), как project_point."""
+    points = np.asarray(points, dtype=float)
+    denominator = points[:, 2] + d
+    factor = np.full(len(points), float(d))
+    np.divide(d, denominator, out=factor, where=denominator != 0)
+    projected = np.empty((len(points), 2))
+    projected[:, 0] = center_x + points[:, 0] * factor
+    projected[:, 1] = center_y - points[:, 1] * factor  # инвертируем y, так как в Canvas ось Y растёт вниз
+    return projected
+
+
+def project_points_orthographic(points, center_x, center_y):
+    """Ортогональная проекция всех точек сразу -> (N, 2)."""
+    points = np.asarray(points, dtype=float)
+    projected = np.empty((len(points), 2))
+    projected[:, 0] = center_x + points[:, 0]
+    projected[:, 1] = center_y - points[:, 1]
+    return projected
+
+
+def as_edge_array(edges, vertex_count):
+    """Рёбра -> массив индексов (M, 2); рёбра, ссылающиеся на несуществующие вершины, отбрасываются."""
+    edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+    valid = ((edges >= 0) & (edges < vertex_count)).all(axis=1)
+    return np.ascontiguousarray(edges[valid])
+
+
+def edge_segments(projected, edges):
+    """Концы рёбер на экране: (M, 4) – x1, y1, x2, y2 для каждого ребра (M, 2)."""
+    return np.hstack((projected[edges[:, 0]], projected[edges[:, 1]]))
+
+
+# Отсечение рёбер перед проекцией.
+# Видимая область задаётся плоскостями (a, b, c, e): точка (x, y, z) внутри, если
+# a * x + b * y + c * z + e >= 0 для каждой плоскости. Для перспективной проекции
+# (камера в z = -d, w = z + d) это ближняя плоскость w >= near и четыре плоскости,
+# проходящие через камеру и края холста; для ортогональной – только края холста.
+# Плоскости линейны по (x, y, z), поэтому ребро отсекается в пространстве модели
+# (алгоритм Лианга – Барски) до деления на w.
+
+NEAR_DISTANCE = 1.0
+
+
+def frustum_planes(d, width, height, center_x, center_y, near=NEAR_DISTANCE, margin=2):
+    """Плоскости (5, 4) пирамиды видимости перспективной проекции project_points; margin – запас в пикселях."""
+    left = center_x + margin           # расстояние от центра до левого края
+    right = width - center_x + margin  # до правого
+    top = center_y + margin
+    bottom = height - center_y + margin
+    return np.array([
+        [0, 0, 1, d - near],              # w = z + d >= near
+        [d, 0, left, left * d],           # x * d / w >= -left
+        [-d, 0, right, right * d],        # x * d / w <= right
+        [0, -d, top, top * d],            # y * d / w <= top (экранная y >= 0)
+        [0, d, bottom, bottom * d],       # y * d / w >= -bottom
+    ], dtype=float)
+
+
+def orthographic_planes(width, height, center_x, center_y, margin=2):
+    """Плоскости (4, 4) видимой области ортогональной проекции."""
+    return np.array([
+        [1, 0, 0, center_x + margin],
+        [-1, 0, 0, width - center_x + margin],
+        [0, -1, 0, center_y + margin],
+        [0, 1, 0, height - center_y + margin],
+    ], dtype=float)
+
+
+def clip_edges(points, edges, planes):
+    """
+    Отсекает рёбра (M, 2) модели с точками (N, 4) плоскостями planes (K, 4).
+    Рёбра целиком вне какой-либо плоскости отбрасываются сразу, остальные обрезаются.
+    Возвращает (начала, концы) видимых частей рёбер – массивы (M', 4) – и индексы этих рёбер.
+    """
+    # Расстояния до плоскостей считаются один раз для каждой вершины
+    distances = points @ planes.T
+    start_distance = distances[edges[:, 0]]
+    end_distance = distances[edges[:, 1]]
+    outside = ((start_distance < 0) & (end_distance < 0)).any(axis=1)
+    visible = np.flatnonzero(~outside)
+    start_distance = start_distance[visible]
+    end_distance = end_distance[visible]
+
+    # Параметры входа t0 и выхода t1 по всем плоскостям
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = start_distance / (start_distance - end_distance)
+    t0 = np.where(start_distance < 0, t, 0.0).max(axis=1, initial=0.0)
+    t1 = np.where(end_distance < 0, t, 1.0).min(axis=1, initial=1.0)
+    keep = t0 <= t1
+    visible, t0, t1 = visible[keep], t0[keep, None], t1[keep, None]
+
+    start = points[edges[visible, 0]]
+    direction = points[edges[visible, 1]] - start
+    return start + t0 * direction, start + t1 * direction, visible
 
@@ -20,6 +20,9 @@ class PolygonEditor(tk.Tk):
         self.point_mode = False         # режим проверки принадлежности точки
         self.line_points = []           # для линии – два конца
         self.test_point = None
+        # Текущая пошаговая заливка (FillStepper) и задержка между шагами, мс
+        self.stepper = None
+        self.debug_delay_var = tk.IntVar(value=50)
         self.create_widgets()
 
     def create_widgets(self):
@@ -49,6 +52,18 @@ class PolygonEditor(tk.Tk):
         btn_fill.pack(pady=5)
         btn_debug_fill.pack(pady=5)
 
+        # Управление пошаговой заливкой
+        debug_frame = tk.Frame(self.btn_frame, bg="lightgrey")
+        debug_frame.pack(pady=5, fill=tk.X)
+        self.btn_pause = tk.Button(debug_frame, text="Пауза", command=self.toggle_debug_pause, width=9)
+        btn_stop = tk.Button(debug_frame, text="Стоп", command=self.stop_debug_fill, width=9)
+        self.btn_pause.pack(side=tk.LEFT)
+        btn_stop.pack(side=tk.RIGHT)
+        scale_delay = tk.Scale(self.btn_frame, label="Задержка шага, мс", from_=0, to=500,
+                               orient=tk.HORIZONTAL, variable=self.debug_delay_var,
+                               command=self.on_debug_delay_change, bg="lightgrey", length=180)
+        scale_delay.pack(pady=5)
+
         # Радиокнопки для выбора метода построения выпуклой оболочки
         hull_frame = tk.Frame(self.btn_frame, bg="lightgrey")
         hull_frame.pack(pady=10, fill=tk.X)
@@ -123,6 +138,7 @@ class PolygonEditor(tk.Tk):
         self.is_closed = True
 
     def clear_canvas(self):
+        self.stop_debug_fill()
         self.canvas.delete("all")
         self.vertices = []
         self.is_closed = False
@@ -239,17 +255,35 @@ class PolygonEditor(tk.Tk):
             return
         from logic import (debug_fill_ordered_edge_list, debug_fill_active_edge_list,
                            debug_seed_fill, debug_scanline_seed_fill)
+        self.stop_debug_fill()
         cx = sum(x for x,y in self.vertices)/len(self.vertices)
         cy = sum(y for x,y in self.vertices)/len(self.vertices)
+        delay = self.debug_delay_var.get()
         method = self.fill_method_var.get()
         if method == "ordered":
-            debug_fill_ordered_edge_list(self.vertices, self.canvas, fill_color="yellow", delay=50)
+            self.stepper = debug_fill_ordered_edge_list(self.vertices, self.canvas, fill_color="yellow", delay=delay)
         elif method == "active":
-            debug_fill_active_edge_list(self.vertices, self.canvas, fill_color="cyan", delay=50)
+            self.stepper = debug_fill_active_edge_list(self.vertices, self.canvas, fill_color="cyan", delay=delay)
         elif method == "seed":
-            debug_seed_fill(self.vertices, self.canvas, (cx, cy), fill_color="magenta", delay=50)
+            self.stepper = debug_seed_fill(self.vertices, self.canvas, (cx, cy), fill_color="magenta", delay=delay)
         elif method == "scanline":
-            debug_scanline_seed_fill(self.vertices, self.canvas, (cx, cy), fill_color="orange", delay=50)
+            self.stepper = debug_scanline_seed_fill(self.vertices, self.canvas, (cx, cy), fill_color="orange", delay=delay)
+
+    def toggle_debug_pause(self):
+        if self.stepper is None or self.stepper.finished:
+            return
+        self.stepper.toggle_pause()
+        self.btn_pause.config(text="Продолжить" if self.stepper.paused else "Пауза")
+
+    def stop_debug_fill(self):
+        if self.stepper is not None:
+            self.stepper.cancel()
+            self.stepper = None
+        self.btn_pause.config(text="Пауза")
+
+    def on_debug_delay_change(self, value):
+        if self.stepper is not None:
+            self.stepper.set_delay(int(float(value)))
 
 if __name__ == "__main__":
     app = PolygonEditor()
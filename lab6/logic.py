@@ -11,18 +11,30 @@
   - segment_intersection(P, Q, R, S): поиск точки пересечения двух отрезков;
   - line_polygon_intersections(line, polygon): поиск точек пересечения линии с многоугольником;
 
-  Алгоритмы заливки:
-  - fill_polygon_ordered_edge_list(vertices, canvas, fill_color): заливка методом растровой развертки (упорядоченный список ребер);
-  - fill_polygon_active_edge_list(vertices, canvas, fill_color): заливка методом растровой развертки с активным списком ребер;
-  - simple_seed_fill(vertices, canvas, seed_point, fill_color): простой алгоритм заливки с затравкой;
-  - scanline_seed_fill(vertices, canvas, seed_point, fill_color): построчная заливка с затравкой;
+  Алгоритмы заливки (sink – приёмник отрезков из модуля spans или холст Tk):
+  - fill_polygon_ordered_edge_list(vertices, sink, fill_color): заливка методом растровой развертки (упорядоченный список ребер);
+  - fill_polygon_active_edge_list(vertices, sink, fill_color): заливка методом растровой развертки с активным списком ребер;
+  - simple_seed_fill(vertices, sink, seed_point, fill_color): простой алгоритм заливки с затравкой;
+  - scanline_seed_fill(vertices, sink, seed_point, fill_color): построчная заливка с затравкой;
+  - polygon_mask(vertices, min_x, min_y, width, height): растеризация многоугольника в логическую маску;
+  - ordered_edge_list_spans(vertices): отрезки заливки упорядоченным списком ребер в виде массива (M, 3);
+  - build_edge_table(vertices): таблица рёбер по столбцам с корзинами по нижней строке;
 
-  Отладочные версии заливки (с задержкой) для пошагового отображения:
+  Пошаговые версии заливки (генераторы шагов):
+  - ordered_edge_list_steps(vertices), active_edge_list_steps(vertices)
+  - seed_fill_steps(vertices, seed_point), scanline_seed_fill_steps(vertices, seed_point)
+
+  Отладочные версии заливки (с задержкой) для пошагового отображения,
+  возвращают FillStepper из модуля stepper:
   - debug_fill_ordered_edge_list(vertices, canvas, fill_color, delay)
   - debug_fill_active_edge_list(vertices, canvas, fill_color, delay)
   - debug_seed_fill(vertices, canvas, seed_point, fill_color, delay)
   - debug_scanline_seed_fill(vertices, canvas, seed_point, fill_color, delay)
 """
+from bisect import bisect_left, bisect_right
+import numpy as np
+from spans import as_span_sink
+from stepper import FillStepper
 
 def cross(o, a, b):
     """Вычисляет векторное произведение (a-o) x (b-o)."""
@@ -185,259 +197,359 @@ def line_polygon_intersections(line, polygon):
     return intersections
 
 # Алгоритмы заливки многоугольника
+# Отрезки заливки передаются приёмнику (см. модуль spans); если вместо приёмника
+# передан холст Tk, отрезки рисуются на нём линиями цвета fill_color.
+# Функции возвращают приёмник.
+
+def ordered_edge_list_spans(vertices):
+    """
+    Растровая развертка с упорядоченным списком ребер в векторной форме.
+    Для каждого ребра сразу перечисляются все пересекаемые им строки y
+    (min(y1, y2) <= y < max(y1, y2)), точки пересечения вычисляются одним
+    выражением над массивами и упорядочиваются по (y, x) через np.lexsort.
+    Возвращает массив int формы (M, 3) со столбцами y, x_start, x_end.
+    """
+    v = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+    if len(v) == 0:
+        return np.empty((0, 3), dtype=np.int64)
+    x1, y1 = v[:, 0], v[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    min_y = int(y1.min())
+    max_y = int(y1.max())
+    sloped = y1 != y2
+    x1, y1, x2, y2 = x1[sloped], y1[sloped], x2[sloped], y2[sloped]
+
+    # Строки, пересекаемые каждым ребром: first <= y < last
+    first = np.maximum(np.ceil(np.minimum(y1, y2)), min_y).astype(np.int64)
+    last = np.minimum(np.ceil(np.maximum(y1, y2)), max_y + 1).astype(np.int64)
+    counts = np.maximum(last - first, 0)
+    edge = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.cumsum(counts) - counts
+    y = first[edge] + np.arange(counts.sum()) - offsets[edge]
 
-def fill_polygon_ordered_edge_list(vertices, canvas, fill_color="yellow"):
+    yf = y.astype(np.float64)
+    x_int = x1[edge] + (yf - y1[edge]) * (x2[edge] - x1[edge]) / (y2[edge] - y1[edge])
+    order = np.lexsort((x_int, y))
+    y = y[order]
+    x_int = x_int[order]
+
+    # Номер пересечения внутри своей строки; пары (0, 1), (2, 3), ...
+    row_start = np.searchsorted(y, y, side="left")
+    row_end = np.searchsorted(y, y, side="right")
+    position = np.arange(len(y)) - row_start
+    left = np.nonzero((position % 2 == 0) & (np.arange(len(y)) + 1 < row_end))[0]
+    spans = np.empty((len(left), 3), dtype=np.int64)
+    spans[:, 0] = y[left]
+    spans[:, 1] = x_int[left].astype(np.int64)
+    spans[:, 2] = x_int[left + 1].astype(np.int64)
+    return spans
+
+def fill_polygon_ordered_edge_list(vertices, sink, fill_color="yellow"):
     """
     Заливка методом растровой развертки с упорядоченным списком ребер.
     Для каждой строки от min_y до max_y вычисляются точки пересечения с ребрами,
     сортируются, и заполняются горизонтальные сегменты.
+    Все отрезки передаются приёмнику одним вызовом add_spans.
     """
-    min_y = int(min(y for x, y in vertices))
-    max_y = int(max(y for x, y in vertices))
-    for y in range(min_y, max_y+1):
-        intersections = []
-        n = len(vertices)
-        for i in range(n):
-            x1, y1 = vertices[i]
-            x2, y2 = vertices[(i+1)%n]
-            if y1 == y2:
-                continue
-            if y >= min(y1, y2) and y < max(y1, y2):
-                x_int = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
-                intersections.append(x_int)
-        intersections.sort()
-        for i in range(0, len(intersections), 2):
-            if i+1 < len(intersections):
-                x_start = int(intersections[i])
-                x_end = int(intersections[i+1])
-                canvas.create_line(x_start, y, x_end, y, fill=fill_color)
-
-def fill_polygon_active_edge_list(vertices, canvas, fill_color="cyan"):
+    sink = as_span_sink(sink, fill_color)
+    sink.add_spans(ordered_edge_list_spans(vertices))
+    return sink
+
+def build_edge_table(vertices):
     """
-    Заливка методом растровой развертки с использованием активного списка ребер.
-    Формируется таблица ребер, затем для каждой строки обновляется список активных ребер,
-    и заливаются горизонтальные сегменты.
+    Таблица рёбер в виде столбцов (struct of arrays): для ребра i списки
+    ymax[i], x[i] (x на нижней строке ребра) и inv_slope[i].
+    Номера рёбер разложены по корзинам buckets[ymin - min_y] по нижней строке.
+    Горизонтальные рёбра пропускаются.
+    Возвращает (min_y, max_y, ymax, x, inv_slope, buckets) или None, если рёбер нет.
     """
     n = len(vertices)
-    ET = []
+    ymin_col, ymax, x, inv_slope = [], [], [], []
     for i in range(n):
         x1, y1 = vertices[i]
         x2, y2 = vertices[(i+1)%n]
         if y1 == y2:
             continue
         if y1 < y2:
-            ymin, ymax, x_at_ymin = y1, y2, x1
-            inv_slope = (x2 - x1)/(y2 - y1)
+            ymin_col.append(int(y1))
+            ymax.append(int(y2))
+            x.append(x1)
+            inv_slope.append((x2 - x1)/(y2 - y1))
         else:
-            ymin, ymax, x_at_ymin = y2, y1, x2
-            inv_slope = (x1 - x2)/(y1 - y2)
-        ET.append({"ymin": int(ymin), "ymax": int(ymax), "x": x_at_ymin, "inv_slope": inv_slope})
-    ET.sort(key=lambda e: e["ymin"])
-    if not ET:
+            ymin_col.append(int(y2))
+            ymax.append(int(y1))
+            x.append(x2)
+            inv_slope.append((x1 - x2)/(y1 - y2))
+    if not ymin_col:
+        return None
+    min_y = min(ymin_col)
+    max_y = max(ymax)
+    buckets = [[] for _ in range(max_y - min_y + 1)]
+    for edge, ymin in enumerate(ymin_col):
+        buckets[ymin - min_y].append(edge)
+    return min_y, max_y, ymax, x, inv_slope, buckets
+
+def active_edge_list_rows(vertices):
+    """
+    Растровая развертка с активным списком ребер: для каждой строки y
+    возвращает (y, [(x_start, x_end), ...]).
+    Активный список хранит номера рёбер, упорядоченные по x. Так как за строку
+    порядок почти не меняется, он поддерживается сортировкой вставками; за тот же
+    проход рёбра, закончившиеся ниже строки y, удаляются сдвигом на месте.
+    """
+    table = build_edge_table(vertices)
+    if table is None:
         return
-    min_y = ET[0]["ymin"]
-    max_y = max(e["ymax"] for e in ET)
+    min_y, max_y, ymax, x, inv_slope, buckets = table
     AEL = []
-    et_index = 0
     for y in range(min_y, max_y):
-        while et_index < len(ET) and ET[et_index]["ymin"] == y:
-            AEL.append(ET[et_index])
-            et_index += 1
-        AEL = [edge for edge in AEL if edge["ymax"] > y]
-        AEL.sort(key=lambda edge: edge["x"])
-        for i in range(0, len(AEL), 2):
-            if i+1 < len(AEL):
-                x_start = int(AEL[i]["x"])
-                x_end = int(AEL[i+1]["x"])
-                canvas.create_line(x_start, y, x_end, y, fill=fill_color)
+        AEL.extend(buckets[y - min_y])
+        # AEL[:count] – уже просмотренные действующие рёбра, упорядоченные по x
+        count = 0
+        for i in range(len(AEL)):
+            edge = AEL[i]
+            if ymax[edge] <= y:
+                continue
+            x_edge = x[edge]
+            j = count - 1
+            while j >= 0 and x[AEL[j]] > x_edge:
+                AEL[j + 1] = AEL[j]
+                j -= 1
+            AEL[j + 1] = edge
+            count += 1
+        del AEL[count:]
+        spans = []
+        for i in range(0, len(AEL) - 1, 2):
+            spans.append((int(x[AEL[i]]), int(x[AEL[i + 1]])))
+        yield y, spans
         for edge in AEL:
-            edge["x"] += edge["inv_slope"]
+            x[edge] += inv_slope[edge]
 
-def simple_seed_fill(vertices, canvas, seed_point, fill_color="magenta"):
+def fill_polygon_active_edge_list(vertices, sink, fill_color="cyan"):
     """
-    Простой алгоритм заливки с затравкой (flood fill) с использованием стека.
-    Для каждого пикселя внутри ограничивающего прямоугольника, если он принадлежит многоугольнику,
-    заливается одиночный пиксель.
+    Заливка методом растровой развертки с использованием активного списка ребер.
+    Рёбра раскладываются по корзинам нижних строк, затем для каждой строки
+    обновляется упорядоченный список активных ребер и заливаются горизонтальные сегменты.
     """
+    sink = as_span_sink(sink, fill_color)
+    for y, spans in active_edge_list_rows(vertices):
+        for x_start, x_end in spans:
+            sink.add_span(y, x_start, x_end)
+    return sink
+
+def polygon_bounds(vertices):
+    """Целочисленный ограничивающий прямоугольник (min_x, min_y, max_x, max_y)."""
     min_x = int(min(x for x,y in vertices))
     max_x = int(max(x for x,y in vertices))
     min_y = int(min(y for x,y in vertices))
     max_y = int(max(y for x,y in vertices))
-    stack = [(int(seed_point[0]), int(seed_point[1]))]
-    visited = set()
-    while stack:
-        x, y = stack.pop()
-        if (x, y) in visited:
-            continue
-        visited.add((x, y))
-        if point_in_polygon((x, y), vertices):
-            canvas.create_line(x, y, x+1, y, fill=fill_color)
-            if x+1 <= max_x:
-                stack.append((x+1, y))
-            if x-1 >= min_x:
-                stack.append((x-1, y))
-            if y+1 <= max_y:
-                stack.append((x, y+1))
-            if y-1 >= min_y:
-                stack.append((x, y-1))
-
-def scanline_seed_fill(vertices, canvas, seed_point, fill_color="orange"):
-    """
-    Построчный алгоритм заливки с затравкой.
-    Из затравочной точки заполняется текущая строка, затем соседние строки.
-    """
-    def fill_line(x, y):
-        x_left = x
-        while point_in_polygon((x_left-1, y), vertices):
-            x_left -= 1
-        x_right = x
-        while point_in_polygon((x_right+1, y), vertices):
-            x_right += 1
-        canvas.create_line(x_left, y, x_right, y, fill=fill_color)
-        return x_left, x_right
-
-    stack = [(int(seed_point[0]), int(seed_point[1]))]
-    visited = set()
-    while stack:
-        x, y = stack.pop()
-        if (x, y) in visited:
-            continue
-        visited.add((x, y))
-        if not point_in_polygon((x, y), vertices):
-            continue
-        x_left, x_right = fill_line(x, y)
-        for new_y in (y-1, y+1):
-            for new_x in range(x_left, x_right+1):
-                if (new_x, new_y) not in visited and point_in_polygon((new_x, new_y), vertices):
-                    stack.append((new_x, new_y))
+    return min_x, min_y, max_x, max_y
 
-# Отладочные версии (пошаговые заливки)
-
-def debug_fill_ordered_edge_list(vertices, canvas, fill_color="yellow", delay=50):
+def polygon_mask(vertices, min_x, min_y, width, height):
     """
-    Отладочная заливка методом растровой развертки с упорядоченным списком ребер.
-    После отрисовки каждой сканирующей строки вызывается update() и задержка delay.
+    Растеризует многоугольник в логическую маску формы (height, width):
+    mask[row, col] == point_in_polygon((min_x + col, min_y + row), vertices).
+    Пересечения рёбер со строкой вычисляются один раз на строку, после чего
+    чётность числа пересечений правее каждого пикселя находится бинарным поиском.
     """
-    min_y = int(min(y for x,y in vertices))
-    max_y = int(max(y for x,y in vertices))
-    for y in range(min_y, max_y+1):
-        intersections = []
-        n = len(vertices)
-        for i in range(n):
-            x1, y1 = vertices[i]
-            x2, y2 = vertices[(i+1)%n]
-            if y1 == y2:
-                continue
-            if y >= min(y1, y2) and y < max(y1, y2):
-                x_int = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
-                intersections.append(x_int)
-        intersections.sort()
-        for i in range(0, len(intersections), 2):
-            if i+1 < len(intersections):
-                x_start = int(intersections[i])
-                x_end = int(intersections[i+1])
-                canvas.create_line(x_start, y, x_end, y, fill=fill_color)
-        canvas.update()
-        canvas.after(delay)
+    mask = np.zeros((height, width), dtype=bool)
+    if not vertices:
+        return mask
+    v = np.asarray(vertices, dtype=np.float64)
+    x1, y1 = v[:, 0], v[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+    xs = np.arange(min_x, min_x + width, dtype=np.float64)
+    for row in range(height):
+        y = min_y + row
+        active = (y1 > y) != (y2 > y)
+        if not active.any():
+            continue
+        a1, b1, a2, b2 = x1[active], y1[active], x2[active], y2[active]
+        x_int = np.sort((a2 - a1) * (y - b1) / (b2 - b1) + a1)
+        # Число пересечений с x < x_int
+        count = len(x_int) - np.searchsorted(x_int, xs, side="right")
+        mask[row] = count % 2 == 1
+    return mask
 
-def debug_fill_active_edge_list(vertices, canvas, fill_color="cyan", delay=50):
+def flood_waves(inside, seed_row, seed_col):
     """
-    Отладочная заливка методом растровой развертки с активным списком ребер.
-    После каждой строки обновляется холст и делается задержка.
+    Заливка 4-связной области маски inside, содержащей затравку.
+    Фронт волны хранится массивом плоских индексов и расширяется целиком за шаг;
+    генератор возвращает каждую новую волну (отсортированные плоские индексы).
     """
-    n = len(vertices)
-    ET = []
-    for i in range(n):
-        x1, y1 = vertices[i]
-        x2, y2 = vertices[(i+1)%n]
-        if y1 == y2:
-            continue
-        if y1 < y2:
-            ymin, ymax, x_at_ymin = y1, y2, x1
-            inv_slope = (x2-x1)/(y2-y1)
-        else:
-            ymin, ymax, x_at_ymin = y2, y1, x2
-            inv_slope = (x1-x2)/(y1-y2)
-        ET.append({"ymin": int(ymin), "ymax": int(ymax), "x": x_at_ymin, "inv_slope": inv_slope})
-    ET.sort(key=lambda e: e["ymin"])
-    if not ET:
+    h, w = inside.shape
+    if not (0 <= seed_row < h and 0 <= seed_col < w):
         return
-    min_y = ET[0]["ymin"]
-    max_y = max(e["ymax"] for e in ET)
-    AEL = []
-    et_index = 0
-    for y in range(min_y, max_y):
-        while et_index < len(ET) and ET[et_index]["ymin"] == y:
-            AEL.append(ET[et_index])
-            et_index += 1
-        AEL = [edge for edge in AEL if edge["ymax"] > y]
-        AEL.sort(key=lambda edge: edge["x"])
-        for i in range(0, len(AEL), 2):
-            if i+1 < len(AEL):
-                x_start = int(AEL[i]["x"])
-                x_end = int(AEL[i+1]["x"])
-                canvas.create_line(x_start, y, x_end, y, fill=fill_color)
-        for edge in AEL:
-            edge["x"] += edge["inv_slope"]
-        canvas.update()
-        canvas.after(delay)
+    flat_inside = inside.ravel()
+    start = seed_row * w + seed_col
+    if not flat_inside[start]:
+        return
+    filled = np.zeros(h * w, dtype=bool)
+    filled[start] = True
+    frontier = np.array([start], dtype=np.int64)
+    while len(frontier):
+        yield frontier
+        col = frontier % w
+        neighbors = np.concatenate((frontier[col < w - 1] + 1,
+                                    frontier[col > 0] - 1,
+                                    frontier[frontier < (h - 1) * w] + w,
+                                    frontier[frontier >= w] - w))
+        neighbors = neighbors[flat_inside[neighbors] & ~filled[neighbors]]
+        frontier = np.unique(neighbors)
+        filled[frontier] = True
 
-def debug_seed_fill(vertices, canvas, seed_point, fill_color="magenta", delay=50):
+def flood_mask(inside, seed_row, seed_col):
+    """Логическая маска пикселей, залитых из затравки (см. flood_waves)."""
+    filled = np.zeros(inside.size, dtype=bool)
+    for wave in flood_waves(inside, seed_row, seed_col):
+        filled[wave] = True
+    return filled.reshape(inside.shape)
+
+def index_spans(flat, width, min_x=0, min_y=0):
+    """Отсортированные плоские индексы пикселей -> массив отрезков (M, 3): y, x_start, x_end."""
+    rows = flat // width
+    cols = flat % width
+    breaks = np.nonzero((np.diff(flat) != 1) | (np.diff(rows) != 0))[0] + 1
+    first = np.concatenate(([0], breaks))
+    last = np.concatenate((breaks, [len(flat)])) - 1
+    spans = np.empty((len(first), 3), dtype=np.int64)
+    spans[:, 0] = min_y + rows[first]
+    spans[:, 1] = min_x + cols[first]
+    spans[:, 2] = min_x + cols[last] + 1
+    return spans
+
+def mask_spans(mask):
+    """Отрезки подряд идущих True в каждой строке маски: массивы row, start, end (end не включается)."""
+    h, w = mask.shape
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    d = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(d == 1)
+    _, ends = np.nonzero(d == -1)
+    return rows, starts, ends
+
+def _polygon_raster(vertices):
+    """Ограничивающий прямоугольник многоугольника и его маска: (min_x, min_y, mask)."""
+    min_x, min_y, max_x, max_y = polygon_bounds(vertices)
+    width = max_x - min_x + 1
+    height = max_y - min_y + 1
+    return min_x, min_y, polygon_mask(vertices, min_x, min_y, width, height)
+
+def simple_seed_fill(vertices, sink, seed_point, fill_color="magenta"):
     """
-    Отладочная (пошаговая) заливка методом простого заполнения с затравкой.
-    После заливки каждого пикселя вызывается canvas.update() и задержка delay.
+    Простой алгоритм заливки с затравкой (flood fill).
+    Многоугольник один раз растеризуется в маску по ограничивающему прямоугольнику,
+    затем 4-связная область затравки заливается по маске.
+    Залитые пиксели передаются приёмнику отрезками по строкам.
     """
-    min_x = int(min(x for x,y in vertices))
-    max_x = int(max(x for x,y in vertices))
-    min_y = int(min(y for x,y in vertices))
-    max_y = int(max(y for x,y in vertices))
-    stack = [(int(seed_point[0]), int(seed_point[1]))]
-    visited = set()
-    while stack:
-        x, y = stack.pop()
-        if (x,y) in visited:
-            continue
-        visited.add((x,y))
-        if not point_in_polygon((x,y), vertices):
-            continue
-        canvas.create_line(x, y, x+1, y, fill=fill_color)
-        canvas.update()
-        canvas.after(delay)
-        if x+1 <= max_x:
-            stack.append((x+1, y))
-        if x-1 >= min_x:
-            stack.append((x-1, y))
-        if y+1 <= max_y:
-            stack.append((x, y+1))
-        if y-1 >= min_y:
-            stack.append((x, y-1))
-
-def debug_scanline_seed_fill(vertices, canvas, seed_point, fill_color="orange", delay=0.2):
-    def fill_line(x, y):
-        x_left = x
-        while point_in_polygon((x_left-1, y), vertices):
-            x_left -= 1
-        x_right = x
-        while point_in_polygon((x_right+1, y), vertices):
-            x_right += 1
-        canvas.create_line(x_left, y, x_right, y, fill=fill_color)
-        canvas.update()
-        canvas.after(delay)
-        return x_left, x_right
-
-    stack = [(int(seed_point[0]), int(seed_point[1]))]
-    visited = set()
+    sink = as_span_sink(sink, fill_color)
+    min_x, min_y, inside = _polygon_raster(vertices)
+    filled = flood_mask(inside, int(seed_point[1]) - min_y, int(seed_point[0]) - min_x)
+    rows, starts, ends = mask_spans(filled)
+    for row, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist()):
+        sink.add_span(min_y + row, min_x + start, min_x + end)
+    return sink
+
+def scanline_seed_spans(vertices, seed_point):
+    """
+    Построчный алгоритм заливки с затравкой; генератор отрезков (y, x_start, x_end).
+    Многоугольник один раз растеризуется в таблицу отрезков (подряд идущих
+    внутренних пикселей каждой строки). Из затравки заливается её отрезок целиком,
+    а в стек кладётся по одной затравке на каждый ещё не залитый отрезок соседних
+    строк, касающийся залитого. Работа пропорциональна числу отрезков, а не пикселей.
+    """
+    min_x, min_y, inside = _polygon_raster(vertices)
+    height = inside.shape[0]
+    rows, starts, ends = mask_spans(inside)
+    # Отрезки строки row имеют номера row_first[row] .. row_first[row + 1] - 1
+    row_first = np.searchsorted(rows, np.arange(height + 1)).tolist()
+    rows, starts, ends = rows.tolist(), starts.tolist(), ends.tolist()
+
+    seed_x = int(seed_point[0]) - min_x
+    seed_y = int(seed_point[1]) - min_y
+    if not (0 <= seed_y < height):
+        return
+    lo, hi = row_first[seed_y], row_first[seed_y + 1]
+    seed_span = bisect_right(starts, seed_x, lo, hi) - 1
+    if seed_span < lo or ends[seed_span] <= seed_x:
+        return
+
+    filled = bytearray(len(starts))
+    stack = [seed_span]
     while stack:
-        x, y = stack.pop()
-        if (x, y) in visited:
+        span = stack.pop()
+        if filled[span]:
             continue
-        visited.add((x, y))
-        if not point_in_polygon((x, y), vertices):
-            continue
-        x_left, x_right = fill_line(x, y)
-        for new_y in (y-1, y+1):
-            for new_x in range(x_left, x_right+1):
-                if (new_x, new_y) not in visited and point_in_polygon((new_x, new_y), vertices):
-                    stack.append((new_x, new_y))
+        filled[span] = 1
+        row, x_left, x_right = rows[span], starts[span], ends[span]
+        yield (min_y + row, min_x + x_left, min_x + x_right)
+        for new_row in (row - 1, row + 1):
+            if not (0 <= new_row < height):
+                continue
+            lo, hi = row_first[new_row], row_first[new_row + 1]
+            # Отрезки соседней строки, пересекающиеся с [x_left, x_right)
+            first = bisect_right(ends, x_left, lo, hi)
+            last = bisect_left(starts, x_right, lo, hi)
+            for neighbor in range(first, last):
+                if not filled[neighbor]:
+                    stack.append(neighbor)
+
+def scanline_seed_fill(vertices, sink, seed_point, fill_color="orange"):
+    """Построчная заливка с затравкой (см. scanline_seed_spans)."""
+    sink = as_span_sink(sink, fill_color)
+    for y, x_start, x_end in scanline_seed_spans(vertices, seed_point):
+        sink.add_span(y, x_start, x_end)
+    return sink
+
+# Пошаговые версии заливки: генераторы шагов, каждый шаг – список отрезков
+# (y, x_start, x_end), нарисованных за этот шаг.
+
+def ordered_edge_list_steps(vertices):
+    """Шаг – одна строка развертки с упорядоченным списком ребер."""
+    spans = ordered_edge_list_spans(vertices)
+    if len(spans) == 0:
+        return
+    breaks = np.nonzero(np.diff(spans[:, 0]))[0] + 1
+    yield from np.split(spans, breaks)
+
+def active_edge_list_steps(vertices):
+    """Шаг – одна строка развертки с активным списком ребер."""
+    for y, spans in active_edge_list_rows(vertices):
+        yield [(y, x_start, x_end) for x_start, x_end in spans]
 
+def seed_fill_steps(vertices, seed_point):
+    """Шаг – очередная волна простой заливки с затравкой."""
+    min_x, min_y, inside = _polygon_raster(vertices)
+    width = inside.shape[1]
+    for wave in flood_waves(inside, int(seed_point[1]) - min_y, int(seed_point[0]) - min_x):
+        yield index_spans(wave, width, min_x, min_y)
+
+def scanline_seed_fill_steps(vertices, seed_point):
+    """Шаг – один отрезок построчной заливки с затравкой."""
+    for span in scanline_seed_spans(vertices, seed_point):
+        yield [span]
+
+# Отладочные версии (пошаговые заливки)
+# Шаги выполняются по таймеру холста (см. модуль stepper), не блокируя окно.
+# Функции сразу возвращают запущенный FillStepper, которым можно
+# приостановить, продолжить или отменить заливку и изменить её скорость.
+
+def debug_fill_ordered_edge_list(vertices, canvas, fill_color="yellow", delay=50):
+    """Отладочная заливка методом растровой развертки с упорядоченным списком ребер: строка за шаг."""
+    return FillStepper(canvas, ordered_edge_list_steps(vertices),
+                       as_span_sink(canvas, fill_color), delay).start()
+
+def debug_fill_active_edge_list(vertices, canvas, fill_color="cyan", delay=50):
+    """Отладочная заливка методом растровой развертки с активным списком ребер: строка за шаг."""
+    return FillStepper(canvas, active_edge_list_steps(vertices),
+                       as_span_sink(canvas, fill_color), delay).start()
+
+def debug_seed_fill(vertices, canvas, seed_point, fill_color="magenta", delay=50):
+    """Отладочная простая заливка с затравкой: волна за шаг."""
+    return FillStepper(canvas, seed_fill_steps(vertices, seed_point),
+                       as_span_sink(canvas, fill_color), delay).start()
 
+def debug_scanline_seed_fill(vertices, canvas, seed_point, fill_color="orange", delay=50):
+    """Отладочная построчная заливка с затравкой: отрезок за шаг."""
+    return FillStepper(canvas, scanline_seed_fill_steps(vertices, seed_point),
+                       as_span_sink(canvas, fill_color), delay).start()
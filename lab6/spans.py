@@ -0,0 +1,95 @@
+"""
+Приёмники горизонтальных отрезков (span), которые порождают алгоритмы заливки.
+Отрезок (y, x_start, x_end) покрывает пиксели x_start <= x < x_end строки y –
+так же, как canvas.create_line(x_start, y, x_end, y).
+
+  - SpanSink: базовый интерфейс приёмника (методы add_span и add_spans);
+  - CanvasSpanSink(canvas, fill_color): рисование на холсте Tk;
+  - MaskSpanSink(width, height, origin): запись в логическую маску NumPy;
+  - SpanListSink(): накопление отрезков в списке / массиве (M, 3);
+  - as_span_sink(target, fill_color): приводит холст Tk или приёмник к приёмнику.
+"""
+import numpy as np
+
+
+class SpanSink:
+    """Интерфейс приёмника отрезков заливки."""
+
+    def add_span(self, y, x_start, x_end):
+        raise NotImplementedError
+
+    def add_spans(self, spans):
+        """Принимает сразу много отрезков: массив или список строк (y, x_start, x_end)."""
+        for y, x_start, x_end in np.asarray(spans).reshape(-1, 3).tolist():
+            self.add_span(y, x_start, x_end)
+
+
+class CanvasSpanSink(SpanSink):
+    """Рисует каждый отрезок линией на холсте Tk."""
+
+    def __init__(self, canvas, fill_color="black"):
+        self.canvas = canvas
+        self.fill_color = fill_color
+
+    def add_span(self, y, x_start, x_end):
+        self.canvas.create_line(x_start, y, x_end, y, fill=self.fill_color)
+
+
+class MaskSpanSink(SpanSink):
+    """
+    Записывает отрезки в логическую маску mask[y, x] размера height x width.
+    origin – координаты (x, y) левого верхнего пикселя маски; всё, что вне маски, отбрасывается.
+    """
+
+    def __init__(self, width, height, origin=(0, 0)):
+        self.mask = np.zeros((height, width), dtype=bool)
+        self.origin = origin
+
+    def add_span(self, y, x_start, x_end):
+        ox, oy = self.origin
+        row = y - oy
+        if row < 0 or row >= self.mask.shape[0]:
+            return
+        start = max(x_start - ox, 0)
+        end = min(x_end - ox, self.mask.shape[1])
+        if start < end:
+            self.mask[row, start:end] = True
+
+    def add_spans(self, spans):
+        spans = np.asarray(spans, dtype=np.int64).reshape(-1, 3)
+        ox, oy = self.origin
+        h, w = self.mask.shape
+        rows = spans[:, 0] - oy
+        starts = np.clip(spans[:, 1] - ox, 0, w)
+        ends = np.clip(spans[:, 2] - ox, 0, w)
+        keep = (rows >= 0) & (rows < h) & (starts < ends)
+        rows, starts, ends = rows[keep], starts[keep], ends[keep]
+        # Разностный массив: +1 в начале отрезка, -1 после конца
+        delta = np.zeros((h, w + 1), dtype=np.int32)
+        np.add.at(delta, (rows, starts), 1)
+        np.add.at(delta, (rows, ends), -1)
+        self.mask |= np.cumsum(delta, axis=1)[:, :w] > 0
+
+
+class SpanListSink(SpanSink):
+    """Накапливает отрезки в списке кортежей (y, x_start, x_end)."""
+
+    def __init__(self):
+        self.spans = []
+
+    def add_span(self, y, x_start, x_end):
+        self.spans.append((y, x_start, x_end))
+
+    def add_spans(self, spans):
+        self.spans.extend(tuple(span) for span in np.asarray(spans).reshape(-1, 3).tolist())
+
+    def to_array(self):
+        """Отрезки в виде массива int формы (M, 3) со столбцами y, x_start, x_end."""
+        return np.array(self.spans, dtype=np.int64).reshape(-1, 3)
+
+
+def as_span_sink(target, fill_color="black"):
+    """Возвращает target, если это приёмник отрезков, иначе оборачивает холст Tk."""
+    if hasattr(target, "add_span"):
+        return target
+    return CanvasSpanSink(target, fill_color)
@@ -0,0 +1,104 @@
+"""
+Пошаговое (отладочное) выполнение заливки без блокировки цикла событий Tk.
+
+Алгоритм заливки задаётся генератором шагов: каждый шаг – список отрезков
+(y, x_start, x_end), которые нужно нарисовать. FillStepper забирает шаги по
+таймеру widget.after, поэтому окно остаётся отзывчивым, а заливку можно
+приостановить, продолжить, отменить и менять её скорость на ходу.
+"""
+import time
+
+FRAME_INTERVAL = 16   # мс между тиками при малой задержке (около 60 кадров в секунду)
+TIME_BUDGET = 0.010   # с на один тик, чтобы не задерживать обработку событий
+
+
+class FillStepper:
+    """
+    Выполняет шаги заливки по таймеру.
+    Если задержка delay (мс) не меньше FRAME_INTERVAL, за тик выполняется один шаг.
+    Иначе тики идут раз в кадр, и за тик выполняется FRAME_INTERVAL / delay шагов
+    (при delay == 0 – сколько успеет за TIME_BUDGET).
+    """
+
+    def __init__(self, widget, steps, sink, delay=50, on_done=None):
+        self.widget = widget
+        self.steps = iter(steps)
+        self.sink = sink
+        self.delay = max(0, int(delay))
+        self.on_done = on_done
+        self.after_id = None
+        self.paused = False
+        self.finished = False
+        self.step_count = 0
+
+    @property
+    def running(self):
+        return not self.finished and not self.paused
+
+    def start(self):
+        self._schedule(0)
+        return self
+
+    def set_delay(self, delay):
+        self.delay = max(0, int(delay))
+
+    def pause(self):
+        if self.finished:
+            return
+        self.paused = True
+        self._cancel_timer()
+
+    def resume(self):
+        if self.finished or not self.paused:
+            return
+        self.paused = False
+        self._schedule(0)
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def cancel(self):
+        self._cancel_timer()
+        if not self.finished:
+            self.finished = True
+            close = getattr(self.steps, "close", None)
+            if close is not None:
+                close()
+
+    def _schedule(self, interval):
+        self.after_id = self.widget.after(interval, self._tick)
+
+    def _cancel_timer(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        self.after_id = None
+        if not self.running:
+            return
+        if self.delay >= FRAME_INTERVAL:
+            batch = 1
+            interval = self.delay
+        else:
+            batch = FRAME_INTERVAL // self.delay if self.delay > 0 else None
+            interval = FRAME_INTERVAL
+        started = time.perf_counter()
+        done = 0
+        while batch is None or done < batch:
+            try:
+                spans = next(self.steps)
+            except StopIteration:
+                self.finished = True
+                if self.on_done is not None:
+                    self.on_done(self)
+                return
+            self.sink.add_spans(spans)
+            done += 1
+            self.step_count += 1
+            if time.perf_counter() - started > TIME_BUDGET:
+                break
+        self._schedule(interval)